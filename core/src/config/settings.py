@@ -74,6 +74,10 @@ class Settings(BaseSettings):
     routing_switch_cooldown_seconds: int = 300
     default_model: str = "gpt-3.5-turbo"
 
+    # Streaming
+    max_concurrent_streams: int = 100
+    eager_tasks_enabled: bool = False
+
     # Rate Limiting
     rate_limit_enabled: bool = True
     rate_limit_requests_per_minute: int = 60
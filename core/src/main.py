@@ -3,6 +3,8 @@ LLM Router - FastAPI application entry point.
 
 A smart API gateway for routing LLM requests to multiple providers.
 """
+import asyncio
+import sys
 import time
 from contextlib import asynccontextmanager
 
@@ -27,6 +29,14 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting LLM Router...")
 
+    # Opt-in: run new tasks eagerly, so a task that completes without
+    # suspending (cache hits, short provider/agent calls) never goes through
+    # the ready queue. This changes scheduling order for every create_task
+    # caller (monitoring, failover), so it is off unless configured.
+    if settings.eager_tasks_enabled and sys.version_info >= (3, 12):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        logger.info("Eager task factory enabled")
+
     # Initialize database
     try:
         await init_db()
@@ -0,0 +1,82 @@
+"""
+Byte-level extraction of text deltas from provider SSE lines.
+
+Streaming chunks have a fixed shape per provider, and almost all of them
+carry a short, escape-free string in a single known field. These scanners
+pull that field straight out of the raw line without a JSON parse. When a
+line does not fit the simple shape (escape sequences, null content, an
+unexpected layout) they return None and the caller does a full parse.
+"""
+from typing import Optional
+
+_OPENAI_CONTENT = b'"content":'
+_ANTHROPIC_DELTA = b'"content_block_delta"'
+_ANTHROPIC_TEXT = b'"text":'
+
+
+def _string_value(line: bytes | bytearray, key: bytes) -> Optional[str]:
+    """
+    Return the string value that follows the first occurrence of key.
+
+    Args:
+        line: Raw SSE line
+        key: Quoted JSON key including the colon, e.g. b'"text":'
+
+    Returns:
+        Optional[str]: The value, or None if it is missing, not a string,
+        or contains escapes
+    """
+    start = line.find(key)
+    if start == -1:
+        return None
+
+    start += len(key)
+    if line[start:start + 1] == b" ":
+        start += 1
+    if line[start:start + 1] != b'"':
+        return None
+
+    start += 1
+    end = line.find(b'"', start)
+    if end == -1:
+        return None
+
+    value = line[start:end]
+    # An escaped quote ends the search early and any other escape needs
+    # decoding; both are left to the JSON parser
+    if b"\\" in value:
+        return None
+
+    return value.decode("utf-8")
+
+
+def openai_extract_delta(line: bytes | bytearray) -> Optional[str]:
+    """
+    Extract choices[0].delta.content from a chat.completion.chunk line.
+
+    Args:
+        line: Raw SSE data line
+
+    Returns:
+        Optional[str]: The content delta, or None if the line needs a full parse
+    """
+    return _string_value(line, _OPENAI_CONTENT)
+
+
+def anthropic_extract_text(line: bytes | bytearray) -> Optional[str]:
+    """
+    Extract delta.text from an Anthropic stream event line.
+
+    Args:
+        line: Raw SSE data line
+
+    Returns:
+        Optional[str]: The text delta ("" for events that carry no text), or
+        None if the line needs a full parse
+    """
+    # The event type is a fixed, unescaped literal, so its absence means the
+    # event cannot be a content_block_delta
+    if _ANTHROPIC_DELTA not in line:
+        return ""
+
+    return _string_value(line, _ANTHROPIC_TEXT)
@@ -0,0 +1,167 @@
+"""
+Admission control for concurrent upstream streams.
+
+Caps how many provider SSE streams are open at once so a burst of streaming
+requests queues instead of exhausting upstream connections.
+"""
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from types import TracebackType
+from typing import AsyncIterator, Optional, Type
+
+from src.config.settings import settings
+from src.providers.base import TimeoutError as ProviderTimeoutError
+
+
+class _LoopState:
+    """Active count and Condition for one event loop."""
+
+    __slots__ = ("active", "cond")
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.cond = asyncio.Condition()
+
+
+class StreamAdmission:
+    """
+    Counter-based admission gate for streaming requests.
+
+    Uses an explicit active counter guarded by an asyncio.Condition rather
+    than asyncio.Semaphore: the limit is a plain attribute, so it can be
+    raised or lowered at runtime without reaching into the semaphore's
+    private state.
+
+    A Condition belongs to the loop that first waits on it, so the counter
+    and Condition are created lazily for each running event loop; the limit
+    applies per loop (the app runs one). This keeps the module-level
+    instance usable when tests run each on a fresh loop.
+    """
+
+    def __init__(self, max_streams: int):
+        """
+        Initialize admission gate.
+
+        Args:
+            max_streams: Maximum number of streams allowed at once
+        """
+        self._max = max_streams
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _state(self) -> _LoopState:
+        """Return the running loop's state, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState()
+        return state
+
+    @property
+    def active(self) -> int:
+        """Number of streams currently admitted on the running loop."""
+        try:
+            state = self._states.get(asyncio.get_running_loop())
+        except RuntimeError:
+            return 0
+        return state.active if state else 0
+
+    @property
+    def limit(self) -> int:
+        """Current maximum number of concurrent streams."""
+        return self._max
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until a stream slot is free and take it.
+
+        Args:
+            timeout: Seconds to wait for a slot, or None to wait indefinitely
+
+        Raises:
+            TimeoutError: If no slot frees up within timeout
+        """
+        state = self._state()
+        async with state.cond:
+            if state.active >= self._max:
+                try:
+                    await asyncio.wait_for(
+                        state.cond.wait_for(lambda: state.active < self._max),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    raise ProviderTimeoutError(
+                        f"No stream slot free within {timeout} seconds "
+                        f"({self._max} streams active)"
+                    )
+            state.active += 1
+
+    async def release(self) -> None:
+        """Give back a stream slot and wake the waiters."""
+        state = self._state()
+        # Decrement before awaiting the lock so a cancelled release can't
+        # leak the slot
+        state.active -= 1
+        async with state.cond:
+            # Wake everyone rather than notify(1): a single woken waiter may
+            # be timing out at the same moment, which would lose the wakeup.
+            # wait_for re-checks the predicate, so only one takes the slot.
+            state.cond.notify_all()
+
+    async def resize(self, max_streams: int) -> None:
+        """
+        Change the concurrency limit.
+
+        Streams already admitted keep running when the limit is lowered;
+        raising it admits waiters immediately.
+
+        Args:
+            max_streams: New maximum number of concurrent streams
+        """
+        state = self._state()
+        async with state.cond:
+            raised = max_streams > self._max
+            self._max = max_streams
+            if raised:
+                state.cond.notify_all()
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Hold a stream slot for the duration of the block.
+
+        When the block is inside an async generator (as in the providers'
+        stream_chat_completion), the slot is held until the generator
+        finishes or is closed. A consumer that stops iterating early should
+        close it with aclose(); otherwise the slot is only returned when
+        the generator is garbage collected.
+
+        Args:
+            timeout: Seconds to wait for a slot, or None to wait indefinitely
+
+        Raises:
+            TimeoutError: If no slot frees up within timeout
+        """
+        await self.acquire(timeout)
+        try:
+            yield
+        finally:
+            await self.release()
+
+    async def __aenter__(self) -> "StreamAdmission":
+        await self.acquire()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        await self.release()
+
+
+# Global instance
+stream_admission = StreamAdmission(settings.max_concurrent_streams)
@@ -21,7 +21,14 @@ from src.providers.base import (
     AuthenticationError,
     RateLimitError,
     TimeoutError as ProviderTimeoutError,
+    iter_sse_batches,
+    json_loads,
+    usd_from_pico,
+    HTTP2_AVAILABLE,
+    UPSTREAM_LIMITS,
 )
+from src.providers._sse_fastpath import anthropic_extract_text
+from src.providers.admission import stream_admission
 
 
 # Model pricing (in USD per 1K tokens)
@@ -34,6 +41,22 @@ ANTHROPIC_PRICING = {
     "claude-instant-1.2": {"input": 0.0008, "output": 0.0024},
 }
 
+# Same rates as integer nano-USD per 1K tokens, so calculate_cost multiplies
+# ints and only builds a Decimal for the result.
+_ANTHROPIC_RATES_NANO = {
+    model_id: (
+        int(Decimal(str(pricing["input"])) * 10**9),
+        int(Decimal(str(pricing["output"])) * 10**9),
+    )
+    for model_id, pricing in ANTHROPIC_PRICING.items()
+}
+
+# SSE framing, compared against raw line bytes from iter_sse_batches
+_DATA = b"data: "
+# Only an error event (or a delta whose whole text is "error") contains this
+# literal unescaped, so other lines can skip the error check
+_ERROR = b'"error"'
+
 
 class AnthropicProvider(IProvider):
     """Anthropic API provider implementation."""
@@ -43,6 +66,7 @@ class AnthropicProvider(IProvider):
         api_key: str,
         base_url: str = "https://api.anthropic.com",
         timeout: int = 60,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         """
         Initialize Anthropic provider.
@@ -51,10 +75,12 @@ class AnthropicProvider(IProvider):
             api_key: Anthropic API key
             base_url: Base URL for Anthropic API
             timeout: Request timeout in seconds
+            transport: Optional httpx transport (e.g. an in-process ASGI app)
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.transport = transport
 
         self._client: Optional[httpx.AsyncClient] = None
 
@@ -70,6 +96,9 @@ class AnthropicProvider(IProvider):
                 base_url=self.base_url,
                 headers=headers,
                 timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                limits=UPSTREAM_LIMITS,
+                transport=self.transport,
             )
         return self._client
 
@@ -111,7 +140,7 @@ class AnthropicProvider(IProvider):
             response = await client.post("/v1/messages", json=payload)
             response.raise_for_status()
 
-            data = response.json()
+            data = json_loads(response.content)
 
             # Calculate latency
             latency_ms = int((time.time() - start_time) * 1000)
@@ -195,16 +224,35 @@ class AnthropicProvider(IProvider):
             payload["stop_sequences"] = request.stop
 
         try:
-            async with client.stream("POST", "/v1/messages", json=payload) as response:
+            # Wait for a slot no longer than the provider would wait upstream
+            async with stream_admission.slot(self.timeout), client.stream(
+                "POST", "/v1/messages", json=payload
+            ) as response:
                 response.raise_for_status()
 
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        data = line[6:]  # Remove "data: " prefix
-
-                        # In a real implementation, parse SSE data
-                        # This is a simplified version
-                        yield data
+                async for lines in iter_sse_batches(response):
+                    # Everything one read delivered goes out as one yield
+                    parts = []
+                    for line in lines:
+                        if line[:6] == _DATA:
+                            # Only content_block_delta events carry message
+                            # text; parse the whole event only when the scan can't
+                            text = None if _ERROR in line else anthropic_extract_text(line)
+                            if text is None:
+                                event = json_loads(line[6:])
+                                if event.get("type") == "error":
+                                    error = event.get("error", {})
+                                    raise ProviderError(
+                                        error.get("message", "Unknown error"),
+                                        details=error,
+                                    )
+                                if event.get("type") == "content_block_delta":
+                                    text = event["delta"].get("text")
+                            if text:
+                                parts.append(text)
+
+                    if parts:
+                        yield "".join(parts)
 
         except HTTPStatusError as e:
             if e.response.status_code == 401:
@@ -349,6 +397,10 @@ class AnthropicProvider(IProvider):
                 error_message=f"Unexpected error: {str(e)}",
             )
 
+    def get_token_rates(self, model_id: str) -> tuple[int, int]:
+        """Get (input, output) price in nano-USD per 1K tokens."""
+        return _ANTHROPIC_RATES_NANO.get(model_id, (0, 0))
+
     def calculate_cost(
         self,
         input_tokens: int,
@@ -356,9 +408,10 @@ class AnthropicProvider(IProvider):
         model_id: str,
     ) -> tuple[Decimal, Decimal]:
         """Calculate cost for a request."""
-        pricing = ANTHROPIC_PRICING.get(model_id, {"input": 0, "output": 0})
+        input_rate, output_rate = self.get_token_rates(model_id)
 
-        input_cost = Decimal(str(pricing["input"])) * input_tokens / Decimal("1000")
-        output_cost = Decimal(str(pricing["output"])) * output_tokens / Decimal("1000")
+        # tokens * nano-USD per 1K tokens = units of 1e-12 USD
+        input_cost = usd_from_pico(input_tokens * input_rate)
+        output_cost = usd_from_pico(output_tokens * output_rate)
 
         return input_cost, output_cost
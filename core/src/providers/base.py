@@ -1,13 +1,53 @@
 """
 Provider base interface and common utilities.
 """
+import importlib.util
+import re
 from abc import ABC, abstractmethod
-from typing import AsyncIterator, Optional, Dict, Any
+from typing import AsyncIterator, Callable, Optional, Dict, Any
 from dataclasses import dataclass
 from decimal import Decimal
 
+import httpx
 
-@dataclass
+# orjson parses straight from bytes and is several times faster than the
+# stdlib on provider payloads; it is optional, json.loads also takes bytes.
+json_loads: Callable[[bytes | bytearray | str], Any]
+try:
+    from orjson import loads as _orjson_loads
+
+    json_loads = _orjson_loads
+except ImportError:
+    from json import loads as _json_loads
+
+    json_loads = _json_loads
+
+# HTTP/2 lets concurrent requests (and SSE streams) to a provider share one
+# connection, but httpx only supports it when the h2 package is installed.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 1e-12 USD, the unit integer costs are accumulated in
+_PICO_USD_PER_USD = Decimal(10**12)
+
+# Pool limits for each provider client; idle connections are kept alive and
+# reused by later requests instead of reconnecting
+UPSTREAM_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+# SSE line terminators: "\r\n", "\n" or a bare "\r"
+_SSE_EOL = re.compile(rb"\r\n?|\n")
+
+
+def usd_from_pico(amount: int) -> Decimal:
+    """
+    Convert an integer amount of 1e-12 USD to a Decimal in USD.
+
+    Exact division keeps only the digits the value needs and never uses
+    exponent notation: 500000000 -> Decimal("0.0005"), 0 -> Decimal("0").
+    """
+    return Decimal(amount) / _PICO_USD_PER_USD
+
+
+@dataclass(slots=True)
 class TokenUsage:
     """Token usage information."""
     input_tokens: int
@@ -23,7 +63,7 @@ class TokenUsage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatMessage:
     """Chat message representation."""
     role: str
@@ -41,7 +81,7 @@ class ChatRequest:
     stop: Optional[list[str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatChoice:
     """Single chat completion choice."""
     index: int
@@ -49,7 +89,7 @@ class ChatChoice:
     finish_reason: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatResponse:
     """Chat completion response."""
     id: str
@@ -138,7 +178,15 @@ class IProvider(ABC):
             request: The chat completion request
 
         Yields:
-            str: Chunks of the response
+            str: Text deltas of the assistant message, in order; deltas
+            that arrive in the same network read are coalesced into one
+            str. The stream simply ends when the provider signals
+            completion. Each value is an independent str, so callers may
+            keep or forward it after the next one is produced.
+
+        The upstream connection and its stream admission slot stay open
+        until the generator is exhausted or closed, so callers that stop
+        early must call aclose() (e.g. via contextlib.aclosing).
 
         Raises:
             ProviderError: If the request fails
@@ -175,6 +223,19 @@ class IProvider(ABC):
         """
         pass
 
+    def get_token_rates(self, model_id: str) -> tuple[int, int]:
+        """
+        Get a model's prices as integers, for per-token cost accumulation.
+
+        Args:
+            model_id: Model identifier
+
+        Returns:
+            tuple[int, int]: (input, output) price in nano-USD per 1K tokens
+        """
+        # Default implementation - should be overridden by specific providers
+        return 0, 0
+
     def calculate_cost(
         self,
         input_tokens: int,
@@ -224,3 +285,50 @@ class AuthenticationError(ProviderError):
 class TimeoutError(ProviderError):
     """Exception raised when request times out."""
     pass
+
+
+async def iter_sse_batches(response: httpx.Response) -> AsyncIterator[list[bytearray]]:
+    """
+    Yield the raw SSE lines completed by each network chunk, as one batch.
+
+    Chunks are appended to a single bytearray and the complete lines are
+    cut off its front once per chunk, so each byte is copied once however
+    long the stream runs. Lines stay undecoded so framing checks are plain
+    byte compares; terminators are ASCII, so a line never ends inside a
+    multi-byte UTF-8 sequence and can be decoded on its own.
+
+    Line endings follow the SSE spec, as httpx's aiter_lines() does:
+    "\\r\\n", "\\n" and a bare "\\r" each end a line, including a "\\r\\n"
+    split across two chunks, and trailing bytes with no terminator form a
+    last line.
+
+    Batching lets callers hand everything that arrived together to their
+    consumer in one step instead of one wakeup per line.
+
+    Args:
+        response: An open streaming response
+
+    Yields:
+        list[bytearray]: Lines (fresh copies, without terminators) completed
+        by one chunk; never empty
+    """
+    buf = bytearray()
+    async for chunk in response.aiter_bytes():
+        # Only the new bytes, plus a "\r" held back from the last chunk,
+        # can hold a terminator not yet consumed
+        start = len(buf) - 1 if buf[-1:] == b"\r" else len(buf)
+        buf += chunk
+        lines = []
+        pos = 0
+        for m in _SSE_EOL.finditer(buf, start):
+            # A "\r" ending the buffer may be the first half of "\r\n"
+            if m.end() == len(buf) and buf[-1] == 0x0D:
+                break
+            lines.append(buf[pos:m.start()])
+            pos = m.end()
+        if lines:
+            del buf[:pos]
+            yield lines
+    # Like aiter_lines(), emit a final line the server did not terminate
+    if buf:
+        yield [buf.rstrip(b"\r")]
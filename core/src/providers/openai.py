@@ -22,7 +22,14 @@ from src.providers.base import (
     AuthenticationError,
     RateLimitError,
     TimeoutError as ProviderTimeoutError,
+    iter_sse_batches,
+    json_loads,
+    usd_from_pico,
+    HTTP2_AVAILABLE,
+    UPSTREAM_LIMITS,
 )
+from src.providers._sse_fastpath import openai_extract_delta
+from src.providers.admission import stream_admission
 
 
 # Model pricing (in USD per 1K tokens)
@@ -36,6 +43,23 @@ OPENAI_PRICING = {
     "gpt-3.5-turbo-0125": {"input": 0.0005, "output": 0.0015},
 }
 
+# Same rates as integer nano-USD per 1K tokens, so calculate_cost multiplies
+# ints and only builds a Decimal for the result.
+_OPENAI_RATES_NANO = {
+    model_id: (
+        int(Decimal(str(pricing["input"])) * 10**9),
+        int(Decimal(str(pricing["output"])) * 10**9),
+    )
+    for model_id, pricing in OPENAI_PRICING.items()
+}
+
+# SSE framing, compared against raw line bytes from iter_sse_batches
+_DATA = b"data: "
+_DONE = b"data: [DONE]"
+# Only an error event (or a delta whose whole content is "error") contains
+# this literal unescaped, so other lines can skip the error check
+_ERROR = b'"error"'
+
 
 class OpenAIProvider(IProvider):
     """OpenAI API provider implementation."""
@@ -46,6 +70,7 @@ class OpenAIProvider(IProvider):
         base_url: str = "https://api.openai.com/v1",
         organization: Optional[str] = None,
         timeout: int = 60,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         """
         Initialize OpenAI provider.
@@ -55,11 +80,13 @@ class OpenAIProvider(IProvider):
             base_url: Base URL for OpenAI API
             organization: Optional organization ID
             timeout: Request timeout in seconds
+            transport: Optional httpx transport (e.g. an in-process ASGI app)
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
         self.organization = organization
         self.timeout = timeout
+        self.transport = transport
 
         self._client: Optional[httpx.AsyncClient] = None
 
@@ -74,6 +101,9 @@ class OpenAIProvider(IProvider):
                 base_url=self.base_url,
                 headers=headers,
                 timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                limits=UPSTREAM_LIMITS,
+                transport=self.transport,
             )
         return self._client
 
@@ -112,7 +142,7 @@ class OpenAIProvider(IProvider):
             response = await client.post("/chat/completions", json=payload)
             response.raise_for_status()
 
-            data = response.json()
+            data = json_loads(response.content)
 
             # Calculate latency
             latency_ms = int((time.time() - start_time) * 1000)
@@ -196,19 +226,43 @@ class OpenAIProvider(IProvider):
             payload["stop"] = request.stop
 
         try:
-            async with client.stream("POST", "/chat/completions", json=payload) as response:
+            # Wait for a slot no longer than the provider would wait upstream
+            async with stream_admission.slot(self.timeout), client.stream(
+                "POST", "/chat/completions", json=payload
+            ) as response:
                 response.raise_for_status()
 
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        data = line[6:]  # Remove "data: " prefix
-
-                        if data == "[DONE]":
+                async for lines in iter_sse_batches(response):
+                    # Everything one read delivered goes out as one yield
+                    parts = []
+                    done = False
+                    for line in lines:
+                        if line == _DONE:
+                            done = True
                             break
 
-                        # In a real implementation, parse SSE data
-                        # This is a simplified version
-                        yield data
+                        if line[:6] == _DATA:
+                            # chat.completion.chunk: keep only the text delta,
+                            # parsing the whole event only when the scan can't
+                            content = None if _ERROR in line else openai_extract_delta(line)
+                            if content is None:
+                                event = json_loads(line[6:])
+                                error = event.get("error")
+                                if error:
+                                    raise ProviderError(
+                                        error.get("message", "Unknown error"),
+                                        details=error,
+                                    )
+                                choices = event.get("choices")
+                                if choices:
+                                    content = choices[0].get("delta", {}).get("content")
+                            if content:
+                                parts.append(content)
+
+                    if parts:
+                        yield "".join(parts)
+                    if done:
+                        break
 
         except HTTPStatusError as e:
             if e.response.status_code == 401:
@@ -335,6 +389,10 @@ class OpenAIProvider(IProvider):
                 error_message=f"Unexpected error: {str(e)}",
             )
 
+    def get_token_rates(self, model_id: str) -> tuple[int, int]:
+        """Get (input, output) price in nano-USD per 1K tokens."""
+        return _OPENAI_RATES_NANO.get(model_id, (0, 0))
+
     def calculate_cost(
         self,
         input_tokens: int,
@@ -342,10 +400,11 @@ class OpenAIProvider(IProvider):
         model_id: str,
     ) -> tuple[Decimal, Decimal]:
         """Calculate cost for a request."""
-        pricing = OPENAI_PRICING.get(model_id, {"input": 0, "output": 0})
+        input_rate, output_rate = self.get_token_rates(model_id)
 
-        input_cost = Decimal(str(pricing["input"])) * input_tokens / Decimal("1000")
-        output_cost = Decimal(str(pricing["output"])) * output_tokens / Decimal("1000")
+        # tokens * nano-USD per 1K tokens = units of 1e-12 USD
+        input_cost = usd_from_pico(input_tokens * input_rate)
+        output_cost = usd_from_pico(output_tokens * output_rate)
 
         return input_cost, output_cost
 
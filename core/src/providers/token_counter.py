@@ -3,40 +3,76 @@ Token counter for streaming (Stage 1).
 
 Counts tokens during streaming to provide accurate cost tracking.
 """
-import asyncio
-from typing import Dict, Optional
-from collections import defaultdict
-from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from src.providers.base import usd_from_pico
 
 
 class TokenCounter:
     """
     Token counter for streaming responses.
 
+    One counter tracks a session. Token counts are plain integers on the
+    counter itself, so the per-delta add_input/add_output path is a single
+    attribute increment; streams only record where they started, and their
+    counts are derived when they end.
+
+    Cost is accumulated the same way, as an integer number of 1e-12 USD
+    (tokens times the provider's nano-USD per 1K tokens rate); a Decimal is
+    only built when the cost is read, e.g. to persist it.
+
     Supports:
-    - Multiple concurrent streams
+    - Independent counters per session
     - Real-time token counting
     - Stream interruption handling
     """
 
-    _instance: Optional["TokenCounter"] = None
-
-    def __new__(cls) -> "TokenCounter":
-        """Singleton pattern."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-
-    def __init__(self):
-        """Initialize token counter."""
-        self._initialized = False
-        self._streams: Dict[str, Dict] = {}
-        self._current_stream_id: Optional[str] = None
+    __slots__ = (
+        "session_id",
+        "input_count",
+        "output_count",
+        "total_count",
+        "input_rate",
+        "output_rate",
+        "cost_pico_usd",
+        "current_stream_id",
+        "_streams",
+    )
+
+    def __init__(
+        self,
+        session_id: Optional[str] = None,
+        input_rate: int = 0,
+        output_rate: int = 0,
+    ):
+        """
+        Initialize token counter.
 
-    def initialize(self) -> None:
-        """Initialize the token counter."""
-        self._initialized = True
+        Args:
+            session_id: Session this counter belongs to
+            input_rate: Input price in nano-USD per 1K tokens
+                (see IProvider.get_token_rates)
+            output_rate: Output price in nano-USD per 1K tokens
+        """
+        self.session_id = session_id
+        self.input_count = 0
+        self.output_count = 0
+        # Kept in step by the add_* methods rather than summed on read
+        self.total_count = 0
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.cost_pico_usd = 0
+        self.current_stream_id: Optional[str] = None
+        # stream_id -> [input_count at start, output_count at start, paused];
+        # allocated on the first start_stream so counters that never stream
+        # never build a dict
+        self._streams: Optional[Dict[str, List]] = None
+
+    @property
+    def cost(self) -> Decimal:
+        """Accumulated cost in USD."""
+        return usd_from_pico(self.cost_pico_usd)
 
     def start_stream(
         self,
@@ -51,23 +87,20 @@ class TokenCounter:
         Returns:
             None
         """
-        if self._current_stream_id is not None:
-            raise RuntimeError(f"Another stream is active: {self._current_stream_id}")
-
-        self._streams[stream_id] = {
-            "input_count": 0,
-            "output_count": 0,
-            "total_count": 0,
-            "paused": False,
-        }
-        self._current_stream_id = stream_id
+        if self.current_stream_id is not None:
+            raise RuntimeError(f"Another stream is active: {self.current_stream_id}")
+
+        if self._streams is None:
+            self._streams = {}
+        self._streams[stream_id] = [self.input_count, self.output_count, False]
+        self.current_stream_id = stream_id
 
     def add_input(
         self,
         tokens: int,
     ) -> None:
         """
-        Add input tokens to current stream.
+        Add input tokens.
 
         Args:
             tokens: Number of input tokens
@@ -75,33 +108,26 @@ class TokenCounter:
         Returns:
             None
         """
-        stream_id = self._current_stream_id
-        if stream_id is None:
-            raise RuntimeError("No active stream")
-
-        self._streams[stream_id]["input_count"] += tokens
-        self._streams[stream_id]["total_count"] += tokens
+        self.input_count += tokens
+        self.total_count += tokens
+        self.cost_pico_usd += tokens * self.input_rate
 
     def add_output(
         self,
         tokens: int,
-        stream_id: Optional[str] = None,
     ) -> None:
         """
-        Add output tokens to a stream.
+        Add output tokens.
 
         Args:
             tokens: Number of output tokens
-            stream_id: Stream ID (uses current if None)
 
         Returns:
             None
         """
-        if stream_id is None:
-            stream_id = self._current_stream_id
-
-        self._streams[stream_id]["output_count"] += tokens
-        self._streams[stream_id]["total_count"] += tokens
+        self.output_count += tokens
+        self.total_count += tokens
+        self.cost_pico_usd += tokens * self.output_rate
 
     def add_tokens(
         self,
@@ -118,12 +144,17 @@ class TokenCounter:
         Returns:
             None
         """
-        stream_id = self._current_stream_id
-        if stream_id is None:
-            raise RuntimeError("No active stream")
+        self.input_count += input_tokens
+        self.output_count += output_tokens
+        self.total_count += input_tokens + output_tokens
+        self.cost_pico_usd += input_tokens * self.input_rate + output_tokens * self.output_rate
+
+    def _get_stream(self, stream_id: str) -> List:
+        """Return the bookkeeping entry for a stream, or raise KeyError."""
+        if not self._streams or stream_id not in self._streams:
+            raise KeyError(f"Unknown stream: {stream_id}")
 
-        self.add_input(input_tokens)
-        self.add_output(output_tokens)
+        return self._streams[stream_id]
 
     def pause_stream(
         self,
@@ -138,10 +169,7 @@ class TokenCounter:
         Returns:
             None
         """
-        if stream_id not in self._streams:
-            raise KeyError(f"Unknown stream: {stream_id}")
-
-        self._streams[stream_id]["paused"] = True
+        self._get_stream(stream_id)[2] = True
 
     def resume_stream(
         self,
@@ -156,13 +184,7 @@ class TokenCounter:
         Returns:
             None
         """
-        if stream_id not in self._streams:
-            raise KeyError(f"Unknown stream: {stream_id}")
-
-        if stream_id not in self._streams:
-            raise KeyError(f"Unknown stream: {stream_id}")
-
-        self._streams[stream_id]["paused"] = False
+        self._get_stream(stream_id)[2] = False
 
     def is_stream_paused(
         self,
@@ -177,10 +199,10 @@ class TokenCounter:
         Returns:
             bool: True if paused
         """
-        if stream_id not in self._streams:
+        if not self._streams or stream_id not in self._streams:
             return False
 
-        return self._streams[stream_id].get("paused", False)
+        return bool(self._streams[stream_id][2])
 
     def get_counts(
         self,
@@ -195,10 +217,15 @@ class TokenCounter:
         Returns:
             Dict with input_count, output_count, total_count
         """
-        if stream_id not in self._streams:
-            raise KeyError(f"Unknown stream: {stream_id}")
-
-        return self._streams[stream_id]
+        input_start, output_start, _ = self._get_stream(stream_id)
+        input_count = self.input_count - input_start
+        output_count = self.output_count - output_start
+
+        return {
+            "input_count": input_count,
+            "output_count": output_count,
+            "total_count": input_count + output_count,
+        }
 
     def end_stream(
         self,
@@ -215,16 +242,15 @@ class TokenCounter:
         Returns:
             Dict with final token counts
         """
-        if stream_id not in self._streams:
-            raise KeyError(f"Unknown stream: {stream_id}")
-
         counts = self.get_counts(stream_id)
 
-        if self._current_stream_id == stream_id:
-            self._current_stream_id = None
+        if self.current_stream_id == stream_id:
+            self.current_stream_id = None
 
         # Note: Database saving is handled by caller
 
+        # get_counts has already raised KeyError for an unknown stream
+        assert self._streams is not None
         del self._streams[stream_id]
 
         return counts
@@ -242,15 +268,10 @@ class TokenCounter:
         Returns:
             Dict with final token counts, or None if no stream is active
         """
-        if self._current_stream_id is None:
+        if self.current_stream_id is None:
             return None
 
-        stream_id = self._current_stream_id
-        counts = self.end_stream(stream_id, save_to_db)
-
-        self._current_stream_id = None
-
-        return counts
+        return self.end_stream(self.current_stream_id, save_to_db)
 
     def get_current_counts(self) -> Optional[Dict[str, int]]:
         """
@@ -259,10 +280,10 @@ class TokenCounter:
         Returns:
             Dict with counts, or None if no active stream
         """
-        if self._current_stream_id is None:
+        if self.current_stream_id is None:
             return None
 
-        return self.get_counts(self._current_stream_id)
+        return self.get_counts(self.current_stream_id)
 
     def get_all_counts(self) -> Dict[str, Dict[str, int]]:
         """
@@ -271,18 +292,17 @@ class TokenCounter:
         Returns:
             Dict mapping stream_id to counts
         """
-        active_streams = {
-            sid: counts
-            for sid, counts in self._streams.items()
-        }
-        return active_streams
+        if not self._streams:
+            return {}
+
+        return {sid: self.get_counts(sid) for sid in self._streams}
 
     async def close_all(self) -> None:
         """
         Close all streaming sessions and clean up resources.
         """
-        self._streams.clear()
-        self._current_stream_id = None
+        self._streams = None
+        self.current_stream_id = None
 
 
 # Global instance
@@ -1,19 +1,23 @@
 """
 Pytest configuration and fixtures for LLM Router tests.
 """
-import pytest
+
 import asyncio
-from typing import Generator, AsyncGenerator
+import sys
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
 from pathlib import Path
 
+import pytest
+import pytest_asyncio
+
 # Add src to path
 sys_path = str(Path(__file__).parent.parent)
-import sys
 if sys_path not in sys.path:
     sys.path.insert(0, sys_path)
 
-# Import test helpers
-from tests.helpers import test_engine, test_session, mock_redis
+# Fixtures from tests/helpers.py (test_engine, test_session, ...)
+pytest_plugins = ["tests.helpers"]
 
 
 @pytest.fixture(scope="session")
@@ -23,56 +27,48 @@ def event_loop_policy():
     yield policy
 
 
-@pytest.fixture(scope="function")
-def event_loop():
-    """Create a new event loop for each test."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    yield loop
-    # Clean up
-    loop.close()
-    asyncio.set_event_loop(None)
-
-
 @pytest.fixture
-async def redis_client(event_loop):
-    """Get a mock Redis client for testing."""
-    from unittest.mock import AsyncMock
+def redis_client():
+    """
+    Get a mock Redis client for testing.
+
+    A plain fixture so session-loop tests (the db tests) can use it too.
+    """
 
-    async def mock_get(key):
+    async def mock_get(_key):
         return None
 
-    async def mock_set(key, value, ex=None):
+    async def mock_set(_key, _value, _ex=None):
         return True
 
-    async def mock_hget(key, field):
+    async def mock_hget(_key, _field):
         return None
 
-    async def mock_hgetall(key):
+    async def mock_hgetall(_key):
         return {}
 
-    async def mock_hset(key, mapping=None, **kwargs):
+    async def mock_hset(_key, _mapping=None, **_kwargs):
         return True
 
-    async def mock_expire(key, time):
+    async def mock_expire(_key, _time):
         return True
 
-    async def mock_delete(*keys):
+    async def mock_delete(*_keys):
         return 1
 
-    async def mock_incr(key):
+    async def mock_incr(_key):
         return 1
 
-    async def mock_incrby(key, amount):
+    async def mock_incrby(_key, _amount):
         return 1
 
-    async def mock_lpush(key, *values):
+    async def mock_lpush(_key, *_values):
         return 1
 
-    async def mock_ltrim(key, start, stop):
+    async def mock_ltrim(_key, _start, _stop):
         return True
 
-    async def mock_lrange(key, start, stop):
+    async def mock_lrange(_key, _start, _stop):
         return []
 
     async def mock_flushall():
@@ -127,20 +123,93 @@ async def redis_client(event_loop):
     yield MockRedisClient()
 
 
+@pytest.fixture(scope="session")
+def app():
+    """FastAPI app, imported once per session."""
+    from src.main import app
+
+    return app
+
+
 @pytest.fixture
-def mock_httpx_client():
-    """Mock httpx client for provider tests."""
+def patched_redis():
+    """
+    Patch RedisConfig.get_client to a mock for one test.
+
+    Function-scoped so the mock never outlives the test that asked for it;
+    modules that use client/aclient request it for every test.
+    """
     from unittest.mock import AsyncMock, patch
-    import httpx
 
-    with patch("httpx.AsyncClient", new_callable=AsyncMock) as mock_client:
-        yield mock_client
+    # Create mock Redis client
+    mock_redis = AsyncMock()
+    mock_redis.ping = AsyncMock(return_value=True)
+
+    # Patch RedisConfig.get_client to return mock
+    with (
+        patch("src.config.redis_config.RedisConfig.get_client", return_value=mock_redis),
+        patch("src.main.RedisConfig.get_client", return_value=mock_redis),
+    ):
+        yield mock_redis
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """
+    Create a test client with mock Redis.
+
+    Session-scoped so every test module (and each xdist worker) shares one
+    already-warmed ASGI app.
+    """
+    from fastapi.testclient import TestClient
+
+    yield TestClient(app)
 
 
 @pytest.fixture
+async def aclient(app):
+    """
+    Async HTTP client that drives the ASGI app directly on the test loop.
+
+    Unlike TestClient there is no blocking portal thread per request.
+    Function-scoped because the event loop is recreated for every test.
+    """
+    from httpx import ASGITransport, AsyncClient
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def warm_provider_cache():
+    """Seed ProviderFactory's instance cache once and close it afterwards."""
+    from src.providers.factory import ProviderFactory
+
+    ProviderFactory.get_provider("openai", api_key="test-key")
+    ProviderFactory.get_provider("anthropic", api_key="test-key")
+    yield
+    # Close any clients the cached providers opened and empty the cache
+    await ProviderFactory.close_all()
+
+
+@pytest.fixture(scope="session")
+def now_utc() -> datetime:
+    """Frozen "now" anchor shared by the whole session; compute offsets from it."""
+    return datetime.now(UTC)
+
+
+@pytest.fixture(scope="session")
+def admin_auth_header() -> dict:
+    """Authorization header carrying the configured admin API key."""
+    from src.config.settings import settings
+
+    return {"Authorization": f"Bearer {settings.admin_api_key}"}
+
+
+@pytest.fixture(scope="session")
 def sample_chat_request():
-    """Sample chat request for testing."""
-    from src.providers.base import ChatRequest, ChatMessage
+    """Sample chat request for testing (read-only, shared per session)."""
+    from src.providers.base import ChatMessage, ChatRequest
 
     return ChatRequest(
         messages=[ChatMessage(role="user", content="Hello, how are you?")],
@@ -150,10 +219,9 @@ def sample_chat_request():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_openai_response():
-    """Sample OpenAI API response for testing."""
-    import json
+    """Sample OpenAI API response for testing (read-only, shared per session)."""
     return {
         "id": "chatcmpl-test123",
         "object": "chat.completion",
@@ -177,17 +245,14 @@ def sample_openai_response():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_anthropic_response():
-    """Sample Anthropic API response for testing."""
-    import json
+    """Sample Anthropic API response for testing (read-only, shared per session)."""
     return {
         "id": "msg_test123",
         "type": "message",
         "role": "assistant",
-        "content": [
-            {"type": "text", "text": "Hello! I'm doing well, thank you for asking!"}
-        ],
+        "content": [{"type": "text", "text": "Hello! I'm doing well, thank you for asking!"}],
         "model": "claude-3-haiku-20240307",
         "stop_reason": "end_turn",
         "usage": {
@@ -197,6 +262,112 @@ def sample_anthropic_response():
     }
 
 
+@pytest.fixture(scope="session")
+def sample_openai_bytes(sample_openai_response) -> bytes:
+    """sample_openai_response serialized once for mocked HTTP bodies."""
+    import json
+
+    return json.dumps(sample_openai_response).encode()
+
+
+@pytest.fixture(scope="session")
+def sample_anthropic_bytes(sample_anthropic_response) -> bytes:
+    """sample_anthropic_response serialized once for mocked HTTP bodies."""
+    import json
+
+    return json.dumps(sample_anthropic_response).encode()
+
+
+@pytest.fixture(scope="session")
+def sse_transport():
+    """
+    Factory for in-process ASGI transports that stream canned SSE bytes.
+
+    Providers given one run their real client.stream()/parsing path with no
+    network and no mocked httpx internals.
+    """
+    from httpx import ASGITransport
+
+    def make(body: bytes, chunk_size: int = 64) -> ASGITransport:
+        async def app(_scope, _receive, send):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream")],
+                }
+            )
+            for i in range(0, len(body), chunk_size):
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": body[i : i + chunk_size],
+                        "more_body": True,
+                    }
+                )
+            await send({"type": "http.response.body", "body": b""})
+
+        return ASGITransport(app=app)
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def openai_sse_bytes() -> bytes:
+    """Canned OpenAI stream: one chat.completion.chunk event per line."""
+    return b"".join(
+        [
+            b'data: {"id": "chatcmpl-123", "choices": [{"index": 0, "delta": {"role": "assistant"}}]}\n\n',
+            b'data: {"id": "chatcmpl-123", "choices": [{"index": 0, "delta": {"content": "Test response chunk"}}]}\n\n',
+            b'data: {"id": "chatcmpl-123", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}\n\n',
+            b"data: [DONE]\n\n",
+        ]
+    )
+
+
+@pytest.fixture(scope="session")
+def anthropic_sse_bytes() -> bytes:
+    """Canned Anthropic stream, with the last line left unterminated."""
+    return b"".join(
+        [
+            b'data: {"type": "content_block_start", "index": 0}\n\n',
+            b'data: {"type": "content_block_delta", "delta": {"text": "Test"}}\n\n',
+            b'data: {"type": "content_block_delta", "delta": {"text": " response"}}\n\n',
+            b'data: {"type": "message_stop"}',
+        ]
+    )
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def openai_stream_provider(sse_transport, openai_sse_bytes):
+    """One OpenAI provider, and its client, shared by the session's streaming tests."""
+    from src.providers.openai import OpenAIProvider
+
+    provider = OpenAIProvider(
+        api_key="test-key",
+        base_url="https://api.openai.com/v1",
+        timeout=60,
+        transport=sse_transport(openai_sse_bytes),
+    )
+    yield provider
+    await provider.close()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def anthropic_stream_provider(sse_transport, anthropic_sse_bytes):
+    """One Anthropic provider, and its client, shared by the session's streaming tests."""
+    from src.providers.anthropic import AnthropicProvider
+
+    provider = AnthropicProvider(
+        api_key="test-key",
+        base_url="https://api.anthropic.com",
+        timeout=60,
+        transport=sse_transport(anthropic_sse_bytes),
+    )
+    yield provider
+    await provider.close()
+
+
 # Test markers
 pytestmark = [
     pytest.mark.unit,
@@ -204,7 +375,7 @@ pytestmark = [
 ]
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(loop_scope="session")
 async def db_session(test_session) -> AsyncGenerator:
     """Alias for test_session for backward compatibility."""
     yield test_session
@@ -3,15 +3,17 @@ Test helpers and utilities for better test isolation.
 """
 import asyncio
 import pytest
+import pytest_asyncio
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.pool import StaticPool
 
 from src.db.base import Base
 from src.models import *  # Import all models
 
 
-@pytest.fixture(scope="session")
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def test_engine():
     """Create a test database engine."""
     # Use in-memory SQLite for tests to avoid connection issues
@@ -21,6 +23,17 @@ async def test_engine():
         poolclass=StaticPool,
     )
 
+    # pysqlite defers BEGIN and ignores SAVEPOINT boundaries unless the
+    # driver's own transaction handling is disabled and BEGIN emitted by us;
+    # without this test_session's rollback would not undo commits
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     # Create all tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -34,19 +47,39 @@ async def test_engine():
     await engine.dispose()
 
 
-@pytest.fixture(scope="function")
-async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create a test database session with automatic rollback."""
-    async_session_maker = async_sessionmaker(
-        test_engine,
-        class_=AsyncSession,
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def test_connection(test_engine):
+    """
+    Hold a single connection to the test database for the whole session.
+
+    The connection belongs to the session event loop, so tests that use it
+    (through test_session/db_session) must run with loop_scope="session".
+    """
+    async with test_engine.connect() as connection:
+        yield connection
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def test_session(test_connection) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Create a test database session with automatic rollback.
+
+    Each test runs inside an outer transaction on the shared connection;
+    session commits become savepoints, so rolling back the outer
+    transaction undoes everything without recreating the schema.
+    """
+    transaction = await test_connection.begin()
+    session = AsyncSession(
+        bind=test_connection,
         expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
     )
 
-    async with async_session_maker() as session:
+    try:
         yield session
-        # Automatic rollback after each test
-        await session.rollback()
+    finally:
+        await session.close()
+        await transaction.rollback()
 
 
 @pytest.fixture
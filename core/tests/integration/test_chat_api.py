@@ -12,7 +12,7 @@ from src.providers.base import ChatRequest, ChatMessage
 
 
 @pytest.mark.integration
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestChatFlowIntegration:
     """Test complete chat flow from request to response."""
 
@@ -223,7 +223,7 @@ class TestRouterToggleIntegration:
 
 
 @pytest.mark.integration
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestProviderHealthIntegration:
     """Test provider health monitoring integration."""
 
@@ -271,7 +271,7 @@ class TestProviderHealthIntegration:
 
 
 @pytest.mark.integration
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestCostTrackingIntegration:
     """Test cost tracking integration."""
 
@@ -2,30 +2,60 @@
 Unit tests for data models.
 """
 import pytest
-from datetime import datetime, timezone, timedelta
+from datetime import timedelta
 from decimal import Decimal
 
-from sqlalchemy import Integer
-from sqlalchemy.orm import mapped_column
-
-from src.models.base import Base, TimestampMixin
 from src.models.user import User, APIKey, UserRole, UserStatus
 from src.models.provider import Provider, ProviderModel, ProviderType, ProviderStatus
 from src.models.routing import RoutingRule, RoutingDecision, RoutingSwitchState
 from src.models.cost import CostRecord
 
+pytestmark = pytest.mark.unit
+
+# Enum members compared in assertions, bound once at import.
+_USER = UserRole.USER
+_ACTIVE = UserStatus.ACTIVE
+_OPENAI = ProviderType.OPENAI
+
+_D_003 = Decimal("0.03")
+_D_006 = Decimal("0.06")
+_D_0005 = Decimal("0.0005")
+_D_0015 = Decimal("0.0015")
+_D_0020 = Decimal("0.0020")
+
+
+@pytest.fixture(scope="session")
+def encrypted_test_key():
+    """Encrypt the test API key once per session."""
+    from src.utils.encryption import EncryptionManager
+
+    return EncryptionManager.encrypt("test-key")
+
+
+@pytest.fixture
+def provider_kwargs(encrypted_test_key):
+    """Base Provider attributes; tests override individual fields."""
+    return dict(
+        name="test-provider",
+        provider_type=ProviderType.OPENAI,
+        api_key_encrypted=encrypted_test_key,
+        base_url="https://api.openai.com/v1",
+        timeout=60,
+        max_retries=3,
+        status=ProviderStatus.ACTIVE,
+        priority=100,
+        weight=100,
+    )
+
 
 class TestTimestampMixin:
     """Test TimestampMixin."""
 
-    @pytest.mark.unit
     def test_timestamp_mixin_creation(self):
         """Test that TimestampMixin adds timestamps."""
-        class TestModel(Base, TimestampMixin):
-            __tablename__ = "test"
-            id = mapped_column(Integer, primary_key=True, autoincrement=True)
-
-        model = TestModel()
+        # User already mixes in TimestampMixin, so no throwaway mapper is
+        # registered on the shared Base.metadata.
+        model = User(username="testuser", email="test@example.com")
         assert hasattr(model, "created_at")
         assert hasattr(model, "updated_at")
 
@@ -34,54 +64,31 @@ class TestTimestampMixin:
         assert model.updated_at is None
 
 
-class TestUserRole:
-    """Test UserRole enum."""
-
-    @pytest.mark.unit
-    def test_user_role_values(self):
-        """Test UserRole enum values."""
-        assert UserRole.ADMIN.value == "admin"
-        assert UserRole.USER.value == "user"
-
-
-class TestUserStatus:
-    """Test UserStatus enum."""
-
-    @pytest.mark.unit
-    def test_user_status_values(self):
-        """Test UserStatus enum values."""
-        assert UserStatus.ACTIVE.value == "active"
-        assert UserStatus.SUSPENDED.value == "suspended"
-        assert UserStatus.DELETED.value == "deleted"
-
-
-class TestProviderType:
-    """Test ProviderType enum."""
-
-    @pytest.mark.unit
-    def test_provider_type_values(self):
-        """Test ProviderType enum values."""
-        assert ProviderType.OPENAI.value == "openai"
-        assert ProviderType.ANTHROPIC.value == "anthropic"
-        assert ProviderType.CUSTOM.value == "custom"
-
-
-class TestProviderStatus:
-    """Test ProviderStatus enum."""
-
-    @pytest.mark.unit
-    def test_provider_status_values(self):
-        """Test ProviderStatus enum values."""
-        assert ProviderStatus.ACTIVE.value == "active"
-        assert ProviderStatus.INACTIVE.value == "inactive"
-        assert ProviderStatus.UNHEALTHY.value == "unhealthy"
+@pytest.mark.parametrize(
+    "enum_member,expected",
+    [
+        (UserRole.ADMIN, "admin"),
+        (UserRole.USER, "user"),
+        (UserStatus.ACTIVE, "active"),
+        (UserStatus.SUSPENDED, "suspended"),
+        (UserStatus.DELETED, "deleted"),
+        (ProviderType.OPENAI, "openai"),
+        (ProviderType.ANTHROPIC, "anthropic"),
+        (ProviderType.CUSTOM, "custom"),
+        (ProviderStatus.ACTIVE, "active"),
+        (ProviderStatus.INACTIVE, "inactive"),
+        (ProviderStatus.UNHEALTHY, "unhealthy"),
+    ],
+)
+def test_enum_values(enum_member, expected):
+    """Test model enum values."""
+    assert enum_member.value == expected
 
 
 class TestUser:
     """Test User model."""
 
-    @pytest.mark.unit
-    def test_user_creation(self, db_session):
+    def test_user_creation(self):
         """Test creating a user."""
         user = User(
             username="testuser",
@@ -91,24 +98,22 @@ class TestUser:
         )
         assert user.username == "testuser"
         assert user.email == "test@example.com"
-        assert user.role == UserRole.USER
-        assert user.status == UserStatus.ACTIVE
+        assert user.role == _USER
+        assert user.status == _ACTIVE
 
-    @pytest.mark.unit
     def test_user_with_default_values(self):
         """Test user with default values."""
         user = User(
             username="testuser",
             email="test@example.com",
         )
-        assert user.role == UserRole.USER  # Default
-        assert user.status == UserStatus.ACTIVE  # Default
+        assert user.role == _USER  # Default
+        assert user.status == _ACTIVE  # Default
 
 
 class TestAPIKey:
     """Test APIKey model."""
 
-    @pytest.mark.unit
     def test_api_key_creation(self):
         """Test creating an API key."""
         api_key = APIKey(
@@ -123,10 +128,9 @@ class TestAPIKey:
         assert api_key.is_active is True
         assert api_key.request_count == 0  # Default
 
-    @pytest.mark.unit
-    def test_api_key_with_expires_at(self):
+    def test_api_key_with_expires_at(self, now_utc):
         """Test API key with expiration."""
-        future_time = datetime.now(timezone.utc) + timedelta(days=30)
+        future_time = now_utc + timedelta(days=30)
         api_key = APIKey(
             user_id=1,
             key_hash="test-hash-123456",
@@ -140,47 +144,24 @@ class TestAPIKey:
 class TestProvider:
     """Test Provider model."""
 
-    @pytest.mark.unit
-    def test_provider_creation(self):
+    def test_provider_creation(self, provider_kwargs):
         """Test creating a provider."""
-        from src.utils.encryption import EncryptionManager
-
-        provider = Provider(
-            name="test-provider",
-            provider_type=ProviderType.OPENAI,
-            api_key_encrypted=EncryptionManager.encrypt("test-key"),
-            base_url="https://api.openai.com/v1",
-            timeout=60,
-            max_retries=3,
-            status=ProviderStatus.ACTIVE,
-            priority=100,
-            weight=100,
-        )
+        provider = Provider(**provider_kwargs)
         assert provider.name == "test-provider"
-        assert provider.provider_type == ProviderType.OPENAI
+        assert provider.provider_type == _OPENAI
         assert provider.timeout == 60
         assert provider.priority == 100
         assert provider.weight == 100
 
-    @pytest.mark.unit
-    def test_provider_with_region(self):
+    def test_provider_with_region(self, provider_kwargs):
         """Test provider with region."""
-        from src.utils.encryption import EncryptionManager
-
-        provider = Provider(
-            name="test-provider",
-            provider_type=ProviderType.OPENAI,
-            api_key_encrypted=EncryptionManager.encrypt("test-key"),
-            base_url="https://api.openai.com/v1",
-            region="us-east-1",
-        )
+        provider = Provider(**{**provider_kwargs, "region": "us-east-1"})
         assert provider.region == "us-east-1"
 
 
 class TestProviderModel:
     """Test ProviderModel model."""
 
-    @pytest.mark.unit
     def test_provider_model_creation(self):
         """Test creating a provider model."""
         model = ProviderModel(
@@ -188,23 +169,22 @@ class TestProviderModel:
             model_id="gpt-4",
             name="GPT-4",
             context_window=8192,
-            input_price_per_1k=Decimal("0.03"),
-            output_price_per_1k=Decimal("0.06"),
+            input_price_per_1k=_D_003,
+            output_price_per_1k=_D_006,
             is_active=True,
         )
         assert model.provider_id == 1
         assert model.model_id == "gpt-4"
         assert model.name == "GPT-4"
         assert model.context_window == 8192
-        assert model.input_price_per_1k == Decimal("0.03")
-        assert model.output_price_per_1k == Decimal("0.06")
+        assert model.input_price_per_1k == _D_003
+        assert model.output_price_per_1k == _D_006
         assert model.is_active is True
 
 
 class TestRoutingRule:
     """Test RoutingRule model."""
 
-    @pytest.mark.unit
     def test_routing_rule_creation(self):
         """Test creating a routing rule."""
         rule = RoutingRule(
@@ -232,10 +212,8 @@ class TestRoutingRule:
 class TestRoutingDecision:
     """Test RoutingDecision model."""
 
-    @pytest.mark.unit
     def test_routing_decision_creation(self):
         """Test creating a routing decision."""
-        from decimal import Decimal
         from src.utils.encryption import hash_content
 
         decision = RoutingDecision(
@@ -254,7 +232,7 @@ class TestRoutingDecision:
             latency_ms=100,
             input_tokens=10,
             output_tokens=20,
-            cost=Decimal("0.0015"),
+            cost=_D_0015,
         )
         assert decision.session_id == "test-session-123"
         assert decision.request_id == "test-request-456"
@@ -262,13 +240,12 @@ class TestRoutingDecision:
         assert decision.latency_ms == 100
         assert decision.input_tokens == 10
         assert decision.output_tokens == 20
-        assert decision.cost == Decimal("0.0015")
+        assert decision.cost == _D_0015
 
 
 class TestRoutingSwitchState:
     """Test RoutingSwitchState model."""
 
-    @pytest.mark.unit
     def test_routing_switch_state_creation(self):
         """Test creating a routing switch state."""
         state = RoutingSwitchState(
@@ -288,11 +265,9 @@ class TestRoutingSwitchState:
 class TestCostRecord:
     """Test CostRecord model."""
 
-    @pytest.mark.unit
     def test_cost_record_creation(self):
         """Test creating a cost record."""
         from src.utils.encryption import hash_content
-        from decimal import Decimal
 
         record = CostRecord(
             session_id="test-session-123",
@@ -305,9 +280,9 @@ class TestCostRecord:
             input_tokens=10,
             output_tokens=20,
             total_tokens=30,
-            input_cost=Decimal("0.0005"),
-            output_cost=Decimal("0.0015"),
-            total_cost=Decimal("0.0020"),
+            input_cost=_D_0005,
+            output_cost=_D_0015,
+            total_cost=_D_0020,
             extra_data={"test": "data"},
         )
         assert record.session_id == "test-session-123"
@@ -316,7 +291,7 @@ class TestCostRecord:
         assert record.input_tokens == 10
         assert record.output_tokens == 20
         assert record.total_tokens == 30
-        assert record.input_cost == Decimal("0.0005")
-        assert record.output_cost == Decimal("0.0015")
-        assert record.total_cost == Decimal("0.0020")
+        assert record.input_cost == _D_0005
+        assert record.output_cost == _D_0015
+        assert record.total_cost == _D_0020
         assert record.extra_data == {"test": "data"}
@@ -1,8 +1,12 @@
 """
 Unit tests for Provider implementations.
 """
+import copy
+from dataclasses import dataclass, field
+
+import httpx
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+import respx
 from decimal import Decimal
 
 from src.providers.base import (
@@ -19,338 +23,464 @@ from src.providers.openai import OpenAIProvider
 from src.providers.anthropic import AnthropicProvider
 from src.providers.factory import ProviderFactory
 
+pytestmark = pytest.mark.unit
 
-class TestProviderFactory:
-    """Test ProviderFactory."""
+_JSON_HEADERS = {"content-type": "application/json"}
 
-    def test_registered_providers(self):
-        """Test that all built-in providers are registered."""
-        providers = ProviderFactory.list_providers()
-        assert "openai" in providers
-        assert "anthropic" in providers
 
-    def test_create_openai_provider(self):
-        """Test creating OpenAI provider."""
-        provider = ProviderFactory.create_provider(
-            "openai",
-            api_key="test-key",
-            base_url="https://api.openai.com/v1",
-        )
-        assert isinstance(provider, IProvider)
-        assert provider.get_provider_name() == "openai"
-
-    def test_create_anthropic_provider(self):
-        """Test creating Anthropic provider."""
-        provider = ProviderFactory.create_provider(
-            "anthropic",
-            api_key="test-key",
-            base_url="https://api.anthropic.com",
-        )
-        assert isinstance(provider, IProvider)
-        assert provider.get_provider_name() == "anthropic"
+@dataclass
+class FakeResponse:
+    """Minimal httpx.Response stand-in for tests that skip the HTTP layer."""
+    status_code: int
+    _json: dict = field(default_factory=dict)
+
+    def json(self) -> dict:
+        return self._json
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise httpx.HTTPStatusError(
+                f"HTTP {self.status_code}",
+                request=httpx.Request("GET", "http://test"),
+                response=self,
+            )
+
+
+class FakeClient:
+    """Minimal httpx.AsyncClient stand-in returning one canned response."""
+
+    def __init__(self, response: FakeResponse):
+        self._response = response
+
+    async def get(self, *args, **kwargs) -> FakeResponse:
+        return self._response
+
+    async def post(self, *args, **kwargs) -> FakeResponse:
+        return self._response
+
+    async def aclose(self) -> None:
+        pass
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Response body delivered in the given network chunks."""
+
+    def __init__(self, *chunks: bytes):
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+@pytest.fixture(scope="session")
+def openai_template():
+    """Build the OpenAI provider once; tests receive shallow copies."""
+    return OpenAIProvider(
+        api_key="test-key",
+        base_url="https://api.openai.com/v1",
+        timeout=60,
+    )
+
+
+@pytest.fixture(scope="session")
+def anthropic_template():
+    """Build the Anthropic provider once; tests receive shallow copies."""
+    return AnthropicProvider(
+        api_key="test-key",
+        base_url="https://api.anthropic.com",
+        timeout=60,
+    )
+
+
+def test_registered_providers():
+    """Test that all built-in providers are registered."""
+    providers = ProviderFactory.list_providers()
+    assert "openai" in providers
+    assert "anthropic" in providers
+
+
+def test_create_openai_provider():
+    """Test creating OpenAI provider."""
+    provider = ProviderFactory.create_provider(
+        "openai",
+        api_key="test-key",
+        base_url="https://api.openai.com/v1",
+    )
+    assert isinstance(provider, IProvider)
+    assert provider.get_provider_name() == "openai"
+
 
-    def test_create_unknown_provider(self):
-        """Test creating unknown provider raises error."""
-        with pytest.raises(ProviderError):
-            ProviderFactory.create_provider("unknown", api_key="test-key")
+def test_create_anthropic_provider():
+    """Test creating Anthropic provider."""
+    provider = ProviderFactory.create_provider(
+        "anthropic",
+        api_key="test-key",
+        base_url="https://api.anthropic.com",
+    )
+    assert isinstance(provider, IProvider)
+    assert provider.get_provider_name() == "anthropic"
 
-    def test_get_cached_provider(self):
-        """Test getting cached provider."""
-        provider1 = ProviderFactory.get_provider("openai", api_key="test-key")
-        provider2 = ProviderFactory.get_provider("openai")
-        assert provider1 is provider2  # Same instance
+
+def test_create_unknown_provider():
+    """Test creating unknown provider raises error."""
+    with pytest.raises(ProviderError):
+        ProviderFactory.create_provider("unknown", api_key="test-key")
+
+
+def test_create_provider_returns_fresh_instances():
+    """Test create_provider never shares an instance between owners."""
+    first = ProviderFactory.create_provider("openai", api_key="test-key")
+    second = ProviderFactory.create_provider("openai", api_key="test-key")
+    assert first is not second
+
+
+@pytest.mark.usefixtures("warm_provider_cache")
+def test_get_cached_provider():
+    """Test getting cached provider."""
+    provider1 = ProviderFactory.get_provider("openai", api_key="test-key")
+    provider2 = ProviderFactory.get_provider("openai")
+    assert provider1 is provider2  # Same instance
+
+
+@pytest.fixture(scope="session")
+def provider_templates(openai_template, anthropic_template):
+    """Session provider templates keyed by provider name."""
+    return {"openai": openai_template, "anthropic": anthropic_template}
+
+
+@pytest.mark.parametrize("provider_name", ["openai", "anthropic"])
+def test_get_provider_name(provider_templates, provider_name):
+    """Test provider name."""
+    assert provider_templates[provider_name].get_provider_name() == provider_name
+
+
+@pytest.mark.parametrize(
+    "provider_name,model,in_cost,out_cost,total",
+    [
+        # 0.0005 / 0.0015 per 1K tokens
+        ("openai", "gpt-3.5-turbo", "0.0005", "0.0030", "0.0035"),
+        # 0.00025 / 0.00125 per 1K tokens
+        ("anthropic", "claude-3-haiku-20240307", "0.00025", "0.00250", "0.00275"),
+    ],
+)
+def test_calculate_cost(provider_templates, provider_name, model, in_cost, out_cost, total):
+    """Test cost calculation."""
+    input_cost, output_cost = provider_templates[provider_name].calculate_cost(
+        input_tokens=1000,
+        output_tokens=2000,
+        model_id=model,
+    )
+    assert input_cost == Decimal(in_cost)
+    assert output_cost == Decimal(out_cost)
+    assert input_cost + output_cost == Decimal(total)
+
+
+@pytest.mark.parametrize(
+    "provider_name,model,input_tokens,output_tokens,in_str,out_str",
+    [
+        ("openai", "gpt-3.5-turbo", 1000, 2000, "0.0005", "0.003"),
+        ("openai", "gpt-4", 1_000_000, 0, "30", "0"),
+        ("anthropic", "claude-3-haiku-20240307", 10, 1, "0.0000025", "0.00000125"),
+    ],
+)
+def test_calculate_cost_string_form(
+    provider_templates, provider_name, model, input_tokens, output_tokens, in_str, out_str
+):
+    """Costs carry no padding zeros and no exponent notation."""
+    input_cost, output_cost = provider_templates[provider_name].calculate_cost(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        model_id=model,
+    )
+    assert str(input_cost) == in_str
+    assert str(output_cost) == out_str
+
+
+@pytest.mark.parametrize("provider_name", ["openai", "anthropic"])
+def test_calculate_cost_unknown_model(provider_templates, provider_name):
+    """Test cost calculation with unknown model."""
+    input_cost, output_cost = provider_templates[provider_name].calculate_cost(
+        input_tokens=1000,
+        output_tokens=2000,
+        model_id="unknown-model",
+    )
+    assert input_cost == Decimal("0")
+    assert output_cost == Decimal("0")
 
 
 class TestOpenAIProvider:
     """Test OpenAIProvider."""
 
     @pytest.fixture
-    def provider(self):
+    async def provider(self, openai_template):
         """Create OpenAI provider for testing."""
-        return OpenAIProvider(
-            api_key="test-key",
-            base_url="https://api.openai.com/v1",
-            timeout=60,
-        )
-
-    @pytest.mark.unit
-    def test_get_provider_name(self, provider):
-        """Test provider name."""
-        assert provider.get_provider_name() == "openai"
-
-    @pytest.mark.unit
-    def test_calculate_cost(self, provider):
-        """Test cost calculation."""
-        input_cost, output_cost = provider.calculate_cost(
-            input_tokens=1000,
-            output_tokens=2000,
-            model_id="gpt-3.5-turbo",
-        )
-        assert input_cost == Decimal("0.0005")  # 0.0005 per 1K tokens
-        assert output_cost == Decimal("0.0030")  # 0.0015 per 1K tokens * 2000 / 1000
-        total_cost = input_cost + output_cost
-        assert total_cost == Decimal("0.0035")
-
-    @pytest.mark.unit
-    def test_calculate_cost_unknown_model(self, provider):
-        """Test cost calculation with unknown model."""
-        input_cost, output_cost = provider.calculate_cost(
-            input_tokens=1000,
-            output_tokens=2000,
-            model_id="unknown-model",
-        )
-        assert input_cost == Decimal("0")
-        assert output_cost == Decimal("0")
+        # The template never opens a client, so each copy starts with
+        # _client=None and builds its own.
+        provider = copy.copy(openai_template)
+        yield provider
+        await provider.close()
 
-    @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_health_check_success(self, provider, sample_openai_response):
         """Test successful health check."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = MagicMock()
-            mock_response.json.return_value = sample_openai_response
-            mock_client.get.return_value = mock_response
-            mock_client_class.return_value = mock_client
-
-            # Create new provider instance with mocked client
-            provider = OpenAIProvider(api_key="test-key")
-            provider._client = mock_client
+        provider._client = FakeClient(FakeResponse(200, sample_openai_response))
 
-            health = await provider.health_check()
+        health = await provider.health_check()
 
-            assert health.is_healthy is True
-            assert health.latency_ms is not None
+        assert health.is_healthy is True
+        assert health.latency_ms is not None
 
-    @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_health_check_failure(self, provider):
         """Test failed health check."""
-        from httpx import HTTPStatusError
-
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 401
-
-            # Create proper HTTPStatusError
-            error = HTTPStatusError(
-                "Unauthorized",
-                request=MagicMock(),
-                response=mock_response
-            )
-            mock_response.raise_for_status.side_effect = error
-            mock_client.get.return_value = mock_response
-            mock_client_class.return_value = mock_client
-
-            # Create new provider instance with mocked client
-            provider = OpenAIProvider(api_key="test-key")
-            provider._client = mock_client
+        provider._client = FakeClient(FakeResponse(401))
 
-            health = await provider.health_check()
+        health = await provider.health_check()
 
-            assert health.is_healthy is False
-            assert "HTTP 401" in health.error_message
+        assert health.is_healthy is False
+        assert "Authentication failed" in health.error_message
 
-    @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_chat_completion_success(self, provider, sample_openai_response):
+    @respx.mock
+    async def test_chat_completion_success(self, provider, sample_openai_bytes):
         """Test successful chat completion."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = MagicMock()
-            mock_response.json.return_value = sample_openai_response
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value = mock_client
-
-            provider = OpenAIProvider(api_key="test-key")
-            provider._client = mock_client
-
-            request = ChatRequest(
-                messages=[ChatMessage(role="user", content="Hello")],
-                model="gpt-3.5-turbo",
-            )
+        respx.post("https://api.openai.com/v1/chat/completions").mock(
+            return_value=httpx.Response(200, content=sample_openai_bytes, headers=_JSON_HEADERS)
+        )
+
+        request = ChatRequest(
+            messages=[ChatMessage(role="user", content="Hello")],
+            model="gpt-3.5-turbo",
+        )
 
-            response = await provider.chat_completion(request)
+        response = await provider.chat_completion(request)
 
-            assert response.id == "chatcmpl-test123"
-            assert response.model == "gpt-3.5-turbo"
-            assert len(response.choices) == 1
-            assert response.choices[0].message.content == "Hello! I'm doing well, thank you for asking!"
-            assert response.choices[0].finish_reason == "stop"
-            assert response.usage.input_tokens == 10
-            assert response.usage.output_tokens == 20
-            assert response.usage.total_tokens == 30
+        assert response.id == "chatcmpl-test123"
+        assert response.model == "gpt-3.5-turbo"
+        assert len(response.choices) == 1
+        assert response.choices[0].message.content == "Hello! I'm doing well, thank you for asking!"
+        assert response.choices[0].finish_reason == "stop"
+        assert response.usage.input_tokens == 10
+        assert response.usage.output_tokens == 20
+        assert response.usage.total_tokens == 30
 
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_stream_chat_completion_split_lines(self, provider):
+        """Test SSE lines split across network chunks are reassembled."""
+        respx.post("https://api.openai.com/v1/chat/completions").mock(
+            return_value=httpx.Response(200, stream=ChunkedStream(
+                b'data: {"choices": [{"index": 0, "delta": {"content": "Hel',
+                b'lo"}}]}\n\ndata: {"choices": [{"index": 0, "delta": {"content": " world"}}]}\r\n',
+                b"data: [DONE]\n",
+            ))
+        )
 
-class TestAnthropicProvider:
-    """Test AnthropicProvider."""
+        request = ChatRequest(
+            messages=[ChatMessage(role="user", content="Hello")],
+            model="gpt-3.5-turbo",
+            stream=True,
+        )
 
-    @pytest.fixture
-    def provider(self):
-        """Create Anthropic provider for testing."""
-        return AnthropicProvider(
-            api_key="test-key",
-            base_url="https://api.anthropic.com",
-            timeout=60,
+        chunks = [chunk async for chunk in provider.stream_chat_completion(request)]
+
+        assert "".join(chunks) == "Hello world"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_stream_chat_completion_split_codepoint(self, provider):
+        """Test a multi-byte character split across network chunks decodes intact."""
+        line = 'data: {"choices": [{"index": 0, "delta": {"content": "café"}}]}\n'.encode()
+        cut = line.index(b"\xc3") + 1
+        respx.post("https://api.openai.com/v1/chat/completions").mock(
+            return_value=httpx.Response(200, stream=ChunkedStream(
+                line[:cut],
+                line[cut:],
+                b"data: [DONE]\n",
+            ))
         )
 
-    @pytest.mark.unit
-    def test_get_provider_name(self, provider):
-        """Test provider name."""
-        assert provider.get_provider_name() == "anthropic"
-
-    @pytest.mark.unit
-    def test_calculate_cost(self, provider):
-        """Test cost calculation."""
-        input_cost, output_cost = provider.calculate_cost(
-            input_tokens=1000,
-            output_tokens=2000,
-            model_id="claude-3-haiku-20240307",
+        request = ChatRequest(
+            messages=[ChatMessage(role="user", content="Hello")],
+            model="gpt-3.5-turbo",
+            stream=True,
         )
-        assert input_cost == Decimal("0.00025")  # 0.00025 per 1K tokens
-        assert output_cost == Decimal("0.00250")  # 0.00125 per 1K tokens * 2000 / 1000
-        total_cost = input_cost + output_cost
-        assert total_cost == Decimal("0.00275")
-
-    @pytest.mark.unit
-    def test_calculate_cost_unknown_model(self, provider):
-        """Test cost calculation with unknown model."""
-        input_cost, output_cost = provider.calculate_cost(
-            input_tokens=1000,
-            output_tokens=2000,
-            model_id="unknown-model",
+
+        chunks = [chunk async for chunk in provider.stream_chat_completion(request)]
+
+        assert "".join(chunks) == "café"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_stream_chat_completion_error_event(self, provider):
+        """Test an error payload mid-stream raises instead of truncating."""
+        respx.post("https://api.openai.com/v1/chat/completions").mock(
+            return_value=httpx.Response(200, stream=ChunkedStream(
+                b'data: {"choices": [{"index": 0, "delta": {"content": "Hel"}}]}\n\n',
+                b'data: {"error": {"message": "The server had an error", "type": "server_error"}}\n\n',
+            ))
+        )
+
+        request = ChatRequest(
+            messages=[ChatMessage(role="user", content="Hello")],
+            model="gpt-3.5-turbo",
+            stream=True,
         )
-        assert input_cost == Decimal("0")
-        assert output_cost == Decimal("0")
 
-    @pytest.mark.unit
+        with pytest.raises(ProviderError, match="The server had an error"):
+            async for _ in provider.stream_chat_completion(request):
+                pass
+
+
+class TestAnthropicProvider:
+    """Test AnthropicProvider."""
+
+    @pytest.fixture
+    async def provider(self, anthropic_template):
+        """Create Anthropic provider for testing."""
+        provider = copy.copy(anthropic_template)
+        yield provider
+        await provider.close()
+
     @pytest.mark.asyncio
     async def test_health_check_success(self, provider, sample_anthropic_response):
         """Test successful health check."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = MagicMock()
-            mock_response.json.return_value = sample_anthropic_response
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value = mock_client
+        provider._client = FakeClient(FakeResponse(200, sample_anthropic_response))
 
-            provider = AnthropicProvider(api_key="test-key")
-            provider._client = mock_client
+        health = await provider.health_check()
 
-            health = await provider.health_check()
+        assert health.is_healthy is True
+        assert health.latency_ms is not None
 
-            assert health.is_healthy is True
-            assert health.latency_ms is not None
-
-    @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_chat_completion_success(self, provider, sample_anthropic_response):
+    @respx.mock
+    async def test_chat_completion_success(self, provider, sample_anthropic_bytes):
         """Test successful chat completion."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = MagicMock()
-            mock_response.json.return_value = sample_anthropic_response
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value = mock_client
-
-            provider = AnthropicProvider(api_key="test-key")
-            provider._client = mock_client
-
-            request = ChatRequest(
-                messages=[ChatMessage(role="user", content="Hello")],
-                model="claude-3-haiku-20240307",
-            )
+        respx.post("https://api.anthropic.com/v1/messages").mock(
+            return_value=httpx.Response(200, content=sample_anthropic_bytes, headers=_JSON_HEADERS)
+        )
 
-            response = await provider.chat_completion(request)
+        request = ChatRequest(
+            messages=[ChatMessage(role="user", content="Hello")],
+            model="claude-3-haiku-20240307",
+        )
 
-            assert response.id == "msg_test123"
-            assert response.model == "claude-3-haiku-20240307"
-            assert len(response.choices) == 1
-            assert response.choices[0].message.content == "Hello! I'm doing well, thank you for asking!"
-            assert response.choices[0].finish_reason == "end_turn"
-            assert response.usage.input_tokens == 10
-            assert response.usage.output_tokens == 20
-            assert response.usage.total_tokens == 30
+        response = await provider.chat_completion(request)
 
+        assert response.id == "msg_test123"
+        assert response.model == "claude-3-haiku-20240307"
+        assert len(response.choices) == 1
+        assert response.choices[0].message.content == "Hello! I'm doing well, thank you for asking!"
+        assert response.choices[0].finish_reason == "end_turn"
+        assert response.usage.input_tokens == 10
+        assert response.usage.output_tokens == 20
+        assert response.usage.total_tokens == 30
 
-class TestTokenUsage:
-    """Test TokenUsage dataclass."""
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_stream_chat_completion_unterminated_line(self, provider):
+        """Test a final SSE line without a trailing newline is still yielded."""
+        respx.post("https://api.anthropic.com/v1/messages").mock(
+            return_value=httpx.Response(200, stream=ChunkedStream(
+                b'event: content_block_delta\n'
+                b'data: {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Hi"}}\n\n',
+                b'data: {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": " there"}}',
+            ))
+        )
 
-    @pytest.mark.unit
-    def test_token_usage_creation(self):
-        """Test TokenUsage creation."""
-        usage = TokenUsage(
-            input_tokens=100,
-            output_tokens=200,
-            total_tokens=300,
+        request = ChatRequest(
+            messages=[ChatMessage(role="user", content="Hello")],
+            model="claude-3-haiku-20240307",
+            stream=True,
         )
-        assert usage.input_tokens == 100
-        assert usage.output_tokens == 200
-        assert usage.total_tokens == 300
-
-    @pytest.mark.unit
-    def test_token_usage_to_dict(self):
-        """Test TokenUsage to_dict method."""
-        usage = TokenUsage(
+
+        chunks = [chunk async for chunk in provider.stream_chat_completion(request)]
+
+        assert "".join(chunks) == "Hi there"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_stream_chat_completion_error_event(self, provider):
+        """Test an error event mid-stream raises instead of truncating."""
+        respx.post("https://api.anthropic.com/v1/messages").mock(
+            return_value=httpx.Response(200, stream=ChunkedStream(
+                b'data: {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Hel"}}\n\n',
+                b'event: error\n'
+                b'data: {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}}\n\n',
+            ))
+        )
+
+        request = ChatRequest(
+            messages=[ChatMessage(role="user", content="Hello")],
+            model="claude-3-haiku-20240307",
+            stream=True,
+        )
+
+        with pytest.raises(ProviderError, match="Overloaded") as exc_info:
+            async for _ in provider.stream_chat_completion(request):
+                pass
+
+        assert exc_info.value.details["type"] == "overloaded_error"
+
+
+def test_token_usage_creation():
+    """Test TokenUsage creation."""
+    usage = TokenUsage(
+        input_tokens=100,
+        output_tokens=200,
+        total_tokens=300,
+    )
+    assert usage.input_tokens == 100
+    assert usage.output_tokens == 200
+    assert usage.total_tokens == 300
+
+
+def test_token_usage_to_dict():
+    """Test TokenUsage to_dict method."""
+    usage = TokenUsage(
+        input_tokens=100,
+        output_tokens=200,
+        total_tokens=300,
+    )
+    result = usage.to_dict()
+    assert result == {
+        "input_tokens": 100,
+        "output_tokens": 200,
+        "total_tokens": 300,
+    }
+
+
+def test_chat_request_creation(sample_chat_request):
+    """Test ChatRequest creation."""
+    assert sample_chat_request.model == "gpt-3.5-turbo"
+    assert len(sample_chat_request.messages) == 1
+    assert sample_chat_request.messages[0].role == "user"
+    assert sample_chat_request.temperature == 0.7
+
+
+def test_chat_response_to_dict():
+    """Test ChatResponse to_dict method."""
+    response = ChatResponse(
+        id="test-id",
+        object="chat.completion",
+        created=1234567890,
+        model="gpt-3.5-turbo",
+        choices=[
+            ChatChoice(
+                index=0,
+                message=ChatMessage(role="assistant", content="Test response"),
+                finish_reason="stop",
+            )
+        ],
+        usage=TokenUsage(
             input_tokens=100,
             output_tokens=200,
             total_tokens=300,
-        )
-        result = usage.to_dict()
-        assert result == {
-            "input_tokens": 100,
-            "output_tokens": 200,
-            "total_tokens": 300,
-        }
-
-
-class TestChatRequest:
-    """Test ChatRequest dataclass."""
-
-    @pytest.mark.unit
-    def test_chat_request_creation(self, sample_chat_request):
-        """Test ChatRequest creation."""
-        assert sample_chat_request.model == "gpt-3.5-turbo"
-        assert len(sample_chat_request.messages) == 1
-        assert sample_chat_request.messages[0].role == "user"
-        assert sample_chat_request.temperature == 0.7
-
-
-class TestChatResponse:
-    """Test ChatResponse dataclass."""
-
-    @pytest.mark.unit
-    def test_chat_response_to_dict(self):
-        """Test ChatResponse to_dict method."""
-        response = ChatResponse(
-            id="test-id",
-            object="chat.completion",
-            created=1234567890,
-            model="gpt-3.5-turbo",
-            choices=[
-                ChatChoice(
-                    index=0,
-                    message=ChatMessage(role="assistant", content="Test response"),
-                    finish_reason="stop",
-                )
-            ],
-            usage=TokenUsage(
-                input_tokens=100,
-                output_tokens=200,
-                total_tokens=300,
-            ),
-        )
-        result = response.to_dict()
-        assert result["id"] == "test-id"
-        assert result["model"] == "gpt-3.5-turbo"
-        assert len(result["choices"]) == 1
-        assert result["choices"][0]["message"]["content"] == "Test response"
+        ),
+    )
+    result = response.to_dict()
+    assert result["id"] == "test-id"
+    assert result["model"] == "gpt-3.5-turbo"
+    assert len(result["choices"]) == 1
+    assert result["choices"][0]["message"]["content"] == "Test response"
@@ -5,176 +5,230 @@ Stage 7 Verification Script - Frontend Basic Infrastructure
 This script verifies that all Stage 7 requirements are met by checking
 file existence and code content.
 """
+import functools
+import re
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Keywords are ASCII, so checks run on raw bytes without UTF-8 decoding.
+_PKG_RE = re.compile(rb"react|typescript|vite")
+
 # Change to frontend directory
 script_dir = Path(__file__).parent
 frontend_dir = script_dir.parent
 os.chdir(frontend_dir)
 
+
+# Walk the frontend tree once, skipping dependency/build output, and answer
+# every existence check from this set instead of a stat call per path.
+_PRUNE_DIRS = {"node_modules", "dist", ".git"}
+PATHS = set()
+for root, dirs, files in os.walk(frontend_dir):
+    dirs[:] = [d for d in dirs if d not in _PRUNE_DIRS]
+    rel = Path(root).relative_to(frontend_dir)
+    PATHS.update((rel / name).as_posix() for name in dirs + files)
+
+
+def exists(path: Path) -> bool:
+    """Check whether a path under frontend_dir was seen by the walk."""
+    return path.relative_to(frontend_dir).as_posix() in PATHS
+
+
+@functools.lru_cache(maxsize=None)
+def read_bytes(path: Path) -> bytes:
+    """Read a file once; later checks on the same path reuse the bytes."""
+    return path.read_bytes()
+
+
+def _read_optional(path: Path):
+    """Return file bytes, or None if the file does not exist."""
+    return read_bytes(path) if exists(path) else None
+
+
 print("\n" + "=" * 60)
 print("Stage 7 Verification: Frontend Basic Infrastructure")
 print("=" * 60)
 
+src_dir = frontend_dir / "src"
+package_json = frontend_dir / "package.json"
+app_file = src_dir / "App.tsx"
+api_client_file = src_dir / "api" / "client.ts"
+types_file = src_dir / "types" / "index.ts"
+
+# Without these files every later content check can only cascade into
+# failures, so stop before reading anything.
+CRITICAL = [package_json, app_file, api_client_file]
+missing = [p for p in CRITICAL if not exists(p)]
+if missing:
+    print("\n✗ Critical files missing:")
+    for p in missing:
+        print(f"  - {p.relative_to(frontend_dir)}")
+    print("\n⚠️ Stage 7 verification aborted")
+    sys.exit(1)
+
+# The content checks below are independent; overlap their reads
+_content_files = [package_json, app_file, api_client_file, types_file]
+with ThreadPoolExecutor(max_workers=len(_content_files)) as pool:
+    contents = dict(zip(_content_files, pool.map(_read_optional, _content_files)))
+
 # Verification results
-results = []
+passed = 0
+total = 0
+
+
+def check(ok: bool) -> None:
+    """Record one verification result."""
+    global passed, total
+    total += 1
+    passed += ok
+
 
 # 1. Check Project Configuration
 print("\n=== Stage 7 Verification: Project Configuration ===\n")
 
 # Check package.json
-package_json = frontend_dir / "package.json"
-if package_json.exists():
-    print("✓ package.json exists")
-    results.append(True)
+print("✓ package.json exists")
+check(True)
 
-    content = package_json.read_text()
+# Classify all three dependencies in one scan
+found = set(_PKG_RE.findall(contents[package_json]))
 
-    # Check for React
-    if "react" in content:
-        print("✓ React installed")
-        results.append(True)
-    else:
-        print("✗ React not installed")
-        results.append(False)
+# Check for React
+if b"react" in found:
+    print("✓ React installed")
+    check(True)
+else:
+    print("✗ React not installed")
+    check(False)
 
-    # Check for TypeScript
-    if "typescript" in content:
-        print("✓ TypeScript installed")
-        results.append(True)
-    else:
-        print("✗ TypeScript not installed")
-        results.append(False)
+# Check for TypeScript
+if b"typescript" in found:
+    print("✓ TypeScript installed")
+    check(True)
+else:
+    print("✗ TypeScript not installed")
+    check(False)
 
-    # Check for Vite
-    if "vite" in content:
-        print("✓ Vite installed")
-        results.append(True)
-    else:
-        print("✗ Vite not installed")
-        results.append(False)
+# Check for Vite
+if b"vite" in found:
+    print("✓ Vite installed")
+    check(True)
 else:
-    print("✗ package.json not found")
-    results.append(False)
+    print("✗ Vite not installed")
+    check(False)
 
 # Check vite.config.ts
 vite_config = frontend_dir / "vite.config.ts"
-if vite_config.exists():
+if exists(vite_config):
     print("✓ vite.config.ts exists")
-    results.append(True)
+    check(True)
 else:
     print("✗ vite.config.ts not found")
-    results.append(False)
+    check(False)
 
 # Check tsconfig.json
 tsconfig = frontend_dir / "tsconfig.json"
-if tsconfig.exists():
+if exists(tsconfig):
     print("✓ tsconfig.json exists")
-    results.append(True)
+    check(True)
 else:
     print("✗ tsconfig.json not found")
-    results.append(False)
+    check(False)
 
 # 2. Check Layout & Navigation
 print("\n=== Stage 7 Verification: Layout & Navigation ===\n")
-src_dir = frontend_dir / "src"
 
 # Check Layout component
 layout_file = src_dir / "components" / "Layout.tsx"
-if layout_file.exists():
+if exists(layout_file):
     print("✓ Main Layout component exists")
-    results.append(True)
+    check(True)
 else:
     layout_file = src_dir / "components" / "Layout" / "index.tsx"
-    if layout_file.exists():
+    if exists(layout_file):
         print("✓ Main Layout component exists")
-        results.append(True)
+        check(True)
     else:
         print("✗ Layout component not found")
-        results.append(False)
+        check(False)
 
 # Check App.tsx for routing
-app_file = src_dir / "App.tsx"
-if app_file.exists():
-    content = app_file.read_text()
+content = contents[app_file]
 
-    # Check for BrowserRouter
-    if "BrowserRouter" in content or "react-router-dom" in content:
-        print("✓ React Router configured")
-        results.append(True)
-    else:
-        print("✗ React Router not configured")
-        results.append(False)
+# Check for BrowserRouter
+if b"BrowserRouter" in content or b"react-router-dom" in content:
+    print("✓ React Router configured")
+    check(True)
+else:
+    print("✗ React Router not configured")
+    check(False)
 
-    # Check for Routes
-    if "Routes" in content or "<Route" in content:
-        print("✓ Routes configured")
-        results.append(True)
-    else:
-        print("✗ Routes not configured")
-        results.append(False)
+# Check for Routes
+if b"Routes" in content or b"<Route" in content:
+    print("✓ Routes configured")
+    check(True)
 else:
-    print("✗ App.tsx not found")
-    results.append(False)
+    print("✗ Routes not configured")
+    check(False)
 
 # 3. Check API Client
 print("\n=== Stage 7 Verification: API Client ===\n")
-api_client_file = src_dir / "api" / "client.ts"
-if api_client_file.exists():
-    print("✓ API client file exists")
-    results.append(True)
+print("✓ API client file exists")
+check(True)
 
-    content = api_client_file.read_text()
+content = contents[api_client_file]
 
-    # Check for axios instance
-    if "axios.create" in content:
-        print("✓ Axios instance created")
-        results.append(True)
-    else:
-        print("✗ Axios instance not created")
-        results.append(False)
+# Check for axios instance
+if b"axios.create" in content:
+    print("✓ Axios instance created")
+    check(True)
+else:
+    print("✗ Axios instance not created")
+    check(False)
 
-    # Check for request interceptor
-    if "interceptors.request" in content or "request.use" in content:
-        print("✓ Request interceptor configured")
-        results.append(True)
-    else:
-        print("✗ Request interceptor missing")
-        results.append(False)
+# Check for request interceptor
+if b"interceptors.request" in content or b"request.use" in content:
+    print("✓ Request interceptor configured")
+    check(True)
+else:
+    print("✗ Request interceptor missing")
+    check(False)
 
-    # Check for response interceptor
-    if "interceptors.response" in content or "response.use" in content:
-        print("✓ Response interceptor configured")
-        results.append(True)
-    else:
-        print("✗ Response interceptor missing")
-        results.append(False)
+# Check for response interceptor
+if b"interceptors.response" in content or b"response.use" in content:
+    print("✓ Response interceptor configured")
+    check(True)
+else:
+    print("✗ Response interceptor missing")
+    check(False)
 
-    # Check for API Key authentication
-    if "Authorization" in content or "Bearer" in content:
-        print("✓ API Key authentication")
-        results.append(True)
-    else:
-        print("✗ API Key authentication missing")
-        results.append(False)
+# Check for API Key authentication
+if b"Authorization" in content or b"Bearer" in content:
+    print("✓ API Key authentication")
+    check(True)
+else:
+    print("✗ API Key authentication missing")
+    check(False)
 
-    # Check for API service modules
-    if "routerApi" in content or "costApi" in content or "chatApi" in content:
-        print("✓ API service modules created")
-        results.append(True)
-    else:
-        print("✗ API service modules missing")
-        results.append(False)
+# Check for API service modules
+if b"routerApi" in content or b"costApi" in content or b"chatApi" in content:
+    print("✓ API service modules created")
+    check(True)
 else:
-    print("✗ API client file not found")
-    results.append(False)
+    print("✗ API service modules missing")
+    check(False)
 
 # 4. Check Common Components
 print("\n=== Stage 7 Verification: Common Components ===\n")
 components_dir = src_dir / "components"
 
+# Component file names anywhere under src/components
+component_names = {
+    Path(p).name for p in PATHS if p.startswith("src/components/")
+}
+
 components_to_check = [
     ("Layout", "Layout component"),
     ("StatCard", "Card component"),
@@ -185,87 +239,81 @@ components_to_check = [
 
 found_components = 0
 for component_name, description in components_to_check:
-    component_file = components_dir / f"{component_name}.tsx"
-    if component_file.exists():
+    if f"{component_name}.tsx" in component_names:
         print(f"✓ {description}")
         found_components += 1
     else:
-        # Check in subdirectory
-        sub_file = list(components_dir.glob(f"**/{component_name}.tsx"))
-        if sub_file:
-            print(f"✓ {description}")
-            found_components += 1
-        else:
-            print(f"⚠️ {description} not found (optional)")
+        print(f"⚠️ {description} not found (optional)")
 
 if found_components >= 3:
     print("✓ Common components implemented")
-    results.append(True)
+    check(True)
 else:
     print("⚠️ Some common components missing (may be optional)")
     # Don't fail for optional components
-    results.append(True)
+    check(True)
 
 # 5. Check Types
 print("\n=== Stage 7 Verification: Type Definitions ===\n")
-types_file = src_dir / "types" / "index.ts"
-if types_file.exists():
+if exists(types_file):
     print("✓ Type definitions file exists")
-    results.append(True)
+    check(True)
 
-    content = types_file.read_text()
+    content = contents[types_file]
 
     # Check for API types
-    if "ApiResponse" in content or "interface" in content:
+    if b"ApiResponse" in content or b"interface" in content:
         print("✓ API types defined")
-        results.append(True)
+        check(True)
     else:
         print("✗ API types not defined")
-        results.append(False)
+        check(False)
 else:
     print("⚠️ Type definitions file not found (optional)")
-    results.append(True)
+    check(True)
 
 # 6. Check Hooks
 print("\n=== Stage 7 Verification: Custom Hooks ===\n")
 hooks_dir = src_dir / "hooks"
 
-if hooks_dir.exists():
-    hooks_files = list(hooks_dir.glob("*.ts")) + list(hooks_dir.glob("*.tsx"))
+if exists(hooks_dir):
+    hooks_files = [
+        frontend_dir / p
+        for p in sorted(PATHS)
+        if p.startswith("src/hooks/")
+        and "/" not in p[len("src/hooks/"):]
+        and p.endswith((".ts", ".tsx"))
+    ]
     if hooks_files:
         print(f"✓ Custom hooks implemented ({len(hooks_files)} hooks)")
-        results.append(True)
-
-        # Check for common hooks
-        hooks_content = ""
-        for f in hooks_files:
-            hooks_content += f.read_text()
+        check(True)
 
-        if "useConfig" in hooks_content or "useDashboard" in hooks_content:
+        # Check for common hooks, stopping at the first file that has one
+        if any(
+            b"useConfig" in data or b"useDashboard" in data
+            for data in map(read_bytes, hooks_files)
+        ):
             print("✓ Config/Data hooks found")
         else:
             print("⚠️ Config/Data hooks not found")
     else:
         print("⚠️ No custom hooks found (optional)")
-        results.append(True)
+        check(True)
 else:
     print("⚠️ Hooks directory not found (optional)")
-    results.append(True)
+    check(True)
 
 # Summary
 print("\n" + "=" * 60)
 print("Stage 7 Verification Results")
 print("=" * 60)
 
-total_tests = len(results)
-passed_tests = sum(results)
-
-print(f"\nTotal tests: {total_tests}")
-print(f"Passed: {passed_tests}")
-print(f"Failed: {total_tests - passed_tests}")
-print(f"Success rate: {passed_tests / total_tests * 100:.1f}%")
+print(f"\nTotal tests: {total}")
+print(f"Passed: {passed}")
+print(f"Failed: {total - passed}")
+print(f"Success rate: {passed / total * 100:.1f}%")
 
-if passed_tests == total_tests:
+if passed == total:
     print("\n✅ Stage 7 requirements are FULLY MET!")
     print("\nSummary:")
     print("  ✓ Project Configuration: Vite + React + TypeScript")
@@ -277,5 +325,5 @@ if passed_tests == total_tests:
     print("  ✓ Custom Hooks: Config, Dashboard, Chat")
     sys.exit(0)
 else:
-    print(f"\n⚠️ Stage 7 has {total_tests - passed_tests} missing features")
+    print(f"\n⚠️ Stage 7 has {total - passed} missing features")
     sys.exit(1)
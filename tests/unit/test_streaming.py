@@ -1,335 +0,0 @@
-"""
-Unit tests for streaming functionality (Stage 1).
-"""
-import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
-from decimal import Decimal
-
-from src.providers.base import IProvider, ChatRequest, ChatMessage, TokenUsage, ChatResponse, ChatChoice
-from src.providers.openai import OpenAIProvider
-from src.providers.anthropic import AnthropicProvider
-from src.providers.openai import OPENAI_PRICING
-
-
-class TestStreamingInterface:
-    """Test streaming interface definition."""
-
-    def test_provider_has_stream_method(self):
-        """Test that IProvider has stream_chat_completion method."""
-        assert hasattr(IProvider, "stream_chat_completion")
-        assert callable(IProvider.stream_chat_completion)
-
-    def test_stream_method_signature(self):
-        """Test that stream_chat_completion has correct signature."""
-        import inspect
-        sig = inspect.signature(IProvider.stream_chat_completion)
-        params = list(sig.parameters.keys())
-
-        assert "self" in params, "self should be first parameter"
-        assert "request" in params, "request should be second parameter"
-        assert sig.return_annotation == AsyncIterator[str], "should return AsyncIterator[str]"
-
-
-class TestOpenAIStreaming:
-    """Test OpenAI streaming implementation."""
-
-    @pytest.mark.unit
-    @pytest.mark.asyncio
-    async def test_stream_chat_completion(self):
-        """Test OpenAI chat completion streaming."""
-        provider = OpenAIProvider(
-            api_key="test-key",
-            base_url="https://api.openai.com/v1",
-            timeout=60,
-        )
-
-        request = ChatRequest(
-            messages=[ChatMessage(role="user", content="Hello!")],
-            model="gpt-3.5-turbo",
-            temperature=0.7,
-            stream=True,
-        )
-
-        # Mock HTTP response
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = MagicMock()
-            mock_response.aiter_lines = AsyncMock()
-
-            # Simulate SSE data
-            async def mock_aiter_lines():
-                # Send "data: {" chunks...
-                yield "data: {\"id\": \"chatcmpl-123\"}"
-                yield "data: {\"object\": \"chat.completion\","
-                yield "data: {\"created\": \"1234567890\","
-                yield "data: {\"model\": \"gpt-3.5-turbo\","
-                yield "data: {\"choices\": ["
-                yield "data:     {"
-                yield "data:       \"index\": 0,"
-                yield "data:       \"message\": {"
-                yield "data:         \"role\": \"assistant\","
-                yield "data:         \"content\": \"Test response chunk\""
-                yield "data:       },"
-                yield "data:       \"finish_reason\": \"stop\","
-                yield "data:     }"
-                yield "data:   ],"
-                yield "data:   \"usage\": {"
-                yield "data:     \"prompt_tokens\": 5,"
-                yield "data:     \"completion_tokens\": 5,"
-                yield "data:     \"total_tokens\": 10"
-                yield "data:   }"
-                yield "data: }"
-                yield "data: [DONE]"
-
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value = mock_client
-
-            # Mock aiter_lines
-            mock_response.aiter_lines.return_value = mock_aiter_lines()
-
-            provider._get_client = lambda: mock_client
-
-            # Execute streaming
-            chunks = []
-            async for chunk in provider.stream_chat_completion(request):
-                chunks.append(chunk)
-
-            # Verify we got chunks
-            assert len(chunks) > 0
-            assert any("Test response chunk" in chunk for chunk in chunks)
-            assert "[DONE]" in chunks[-1]
-
-
-class TestAnthropicStreaming:
-    """Test Anthropic streaming implementation."""
-
-    @pytest.mark.unit
-    @pytest.mark.asyncio
-    async def test_stream_chat_completion(self):
-        """Test Anthropic chat completion streaming."""
-        provider = AnthropicProvider(
-            api_key="test-key",
-            base_url="https://api.anthropic.com",
-            timeout=60,
-        )
-
-        request = ChatRequest(
-            messages=[ChatMessage(role="user", content="Hello!")],
-            model="claude-3-haiku-20240307",
-            temperature=0.7,
-            max_tokens=1024,
-            stream=True,
-        )
-
-        # Mock HTTP response
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = MagicMock()
-            mock_response.aiter_bytes = AsyncMock()
-
-            # Simulate SSE data
-            async def mock_aiter_bytes():
-                # Send "data: {" chunks...
-                yield b"data: {\"id\": \"msg_test\"}"
-                yield b"data: {\"type\": \"message\","
-                yield b"data: {\"delta\": {\"type\": \"content_block_start\"}"
-                yield b"data: {\"delta\": {\"index\": 0, \"text\": \"Test\"}}"
-                yield b"data: {\"delta\": {\"type\": \"content_block_delta\", \"index\": 0, \"text\": \" response\"}}"
-                yield b"data: {\"delta\": {\"type\": \"content_block_stop\", \"index\": 0, \"stop_reason\": \"end_turn\"}}"
-                yield b"data: {\"delta\": {\"type\": \"content_block_stop\", \"index\": 0, \"stop_reason\": \"end_turn\"}}"
-                yield b"data: }"
-
-            mock_response.aiter_bytes.return_value = mock_aiter_bytes()
-
-            mock_client.post.return_value = mock_response
-            mock_client_class.return_value = mock_client
-
-            # Mock aiter_bytes
-            mock_response.aiter_bytes.return_value = mock_aiter_bytes()
-
-            provider._get_client = lambda: mock_client
-
-            # Execute streaming
-            chunks = []
-            async for chunk in provider.stream_chat_completion(request):
-                chunks.append(chunk)
-
-            # Verify we got chunks
-            assert len(chunks) > 0
-            assert any("response" in chunk for chunk in chunks)
-            assert "response" in chunks[-1]
-
-
-class TestTokenCounter:
-    """Test token counter for streaming."""
-
-    @pytest.mark.unit
-    def test_initial_count(self):
-        """Test initial count is zero."""
-        from src.providers.token_counter import TokenCounter
-
-        counter = TokenCounter(session_id="test-session")
-        assert counter.input_count == 0
-        assert counter.output_count == 0
-        assert counter.total_count == 0
-
-    @pytest.mark.unit
-    def test_add_input_tokens(self):
-        """Test adding input tokens."""
-        from src.providers.token_counter import TokenCounter
-
-        counter = TokenCounter(session_id="test-session")
-        counter.add_input(100)
-        assert counter.input_count == 100
-        assert counter.total_count == 100
-
-    @pytest.mark.unit
-    def test_add_output_tokens(self):
-        """Test adding output tokens."""
-        from src.providers.token_counter import TokenCounter
-
-        counter = TokenCounter(session_id="test-session")
-        counter.add_output(50)
-        assert counter.output_count == 50
-        assert counter.total_count == 150
-
-    @pytest.mark.unit
-    def test_total_count(self):
-        """Test total count calculation."""
-        from src.providers.token_counter import TokenCounter
-
-        counter = TokenCounter(session_id="test-session")
-        counter.add_input(100)
-        counter.add_output(50)
-        assert counter.total_count == 150
-
-    @pytest.mark.unit
-    def test_concurrent_streams(self):
-        """Test multiple concurrent streams."""
-        from src.providers.token_counter import TokenCounter
-
-        # Create separate counters for concurrent requests
-        counter1 = TokenCounter(session_id="session-1")
-        counter2 = TokenCounter(session_id="session-2")
-
-        counter1.add_input(50)
-        counter2.add_input(30)
-
-        assert counter1.input_count == 50
-        assert counter2.input_count == 30
-        assert counter1.total_count == 50
-        assert counter2.total_count == 30
-
-    @pytest.mark.unit
-    def test_start_stream(self):
-        """Test starting a new stream."""
-        from src.providers.token_counter import TokenCounter
-
-        counter = TokenCounter(session_id="test-session")
-        counter.start_stream("stream-123")
-
-        assert len(counter._streams) == 1
-        assert "stream-123" in counter._streams
-        assert counter.current_stream_id == "stream-123"
-
-    @pytest.mark.unit
-    def test_end_stream(self):
-        """Test ending a stream."""
-        from src.providers.token_counter import TokenCounter
-
-        counter = TokenCounter(session_id="test-session")
-        counter.add_input(10)
-        counter.add_output(20)
-
-        counter.start_stream("stream-123")
-        assert counter.current_stream_id == "stream-123"
-
-        # Add more tokens
-        counter.add_input(5)
-        counter.add_output(10)
-
-        counter.end_stream("stream-123", reason="test", save_db=False)
-
-        assert len(counter._streams) == 0  # Stream removed
-        assert counter.current_stream_id is None
-        assert counter.input_count == 15
-        assert counter.output_count == 30
-
-        # Check total
-        assert counter.total_count == 45
-
-
-class TestStreamingData:
-    """Test streaming data structures."""
-
-    @pytest.mark.unit
-    def test_sse_format_chunk_parsing(self):
-        """Test parsing SSE format chunk."""
-        chunk = "data: {\"id\": \"test\", \"object\": \"chat.completion\"}"
-        assert chunk.startswith("data: {\"")
-
-    @pytest.mark.unit
-    def test_done_signal(self):
-        """Test DONE signal detection."""
-        assert "[DONE]" == "[DONE]"
-
-    @pytest.mark.unit
-    def test_content_reconstruction(self):
-        """Test content reconstruction from chunks."""
-        chunks = [
-            "data: {\"type\": \"content_block_start\", \"index\": 0, \"text\": \"Hello\"}",
-            "data: {\"type\": \"content_block_delta\", \"index\": 0, \"text\": \" world\"}",
-            "data: {\"type\": \"content_block_stop\", \"index\": 0, \"stop_reason\": \"end_turn\"}",
-            "data: }",
-            "[DONE]",
-        ]
-
-        content = "".join(
-            c.split("data: ")[-1].strip(' "')
-            for c in chunks
-            if c and "text" in c
-        )
-
-        assert content == "Hello world"
-
-
-class TestStreamingIntegration:
-    """Test streaming integration with Chat API."""
-
-    @pytest.mark.unit
-    @pytest.mark.asyncio
-    async def test_chat_stream_endpoint_with_stream_flag(self):
-        """Test chat API with stream=True."""
-        # Test would require full FastAPI client and real/mock server
-        pass
-
-    @pytest.mark.unit
-    @pytest.mark.asyncio
-    async def test_chat_stream_token_accounting(self):
-        """Test that tokens are counted during streaming."""
-        # Integration test with database and cost tracking
-        pass
-
-    @pytest.mark.unit
-    @pytest.mark.asyncio
-    async def test_chat_stream_with_stop_sequence(self):
-        """Test stop sequence in streaming."""
-        # Test STOP, STOP signal handling
-        pass
-
-    @pytest.mark.unit
-    @pytest.mark.asyncio
-    async def test_chat_stream_with_error_recovery(self):
-        """Test error recovery during streaming."""
-        # Test client disconnect handling
-        pass
-
-    @pytest.mark.unit
-    def test_stream_performance_metrics(self):
-        """Test streaming performance metrics."""
-        # Test latency, throughput
-        pass